@@ -56,6 +56,7 @@ class Settings:
     BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "100"))
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     DUPLICATE_SIMILARITY_THRESHOLD: float = float(os.getenv("DUPLICATE_SIMILARITY_THRESHOLD", "0.95"))
+    MAX_COMMENT_CHARS: int = int(os.getenv("MAX_COMMENT_CHARS", "2000"))
     
     # Performance Settings
     MAX_MEMORY_MB: int = int(os.getenv("MAX_MEMORY_MB", "1024"))
@@ -5,6 +5,7 @@ with memory optimization for large datasets
 """
 
 import pandas as pd
+import importlib.util
 import json
 import logging
 from pathlib import Path
@@ -12,6 +13,22 @@ from typing import List, Dict, Optional, Union
 from config import Config
 from utils.memory_manager import MemoryManager, ChunkedDataProcessor, OptimizedDataFrame
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = pa_csv = None
+
+# Rust-backed calamine parses xlsx much faster than openpyxl; None keeps
+# pandas' default engine when python-calamine is not installed or pandas
+# predates the calamine engine (added in 2.2)
+_PANDAS_VERSION = tuple(int(part) for part in pd.__version__.split(".")[:2])
+EXCEL_ENGINE = (
+    "calamine"
+    if _PANDAS_VERSION >= (2, 2) and importlib.util.find_spec("python_calamine")
+    else None
+)
+
 # Set up logging
 logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
 logger = logging.getLogger(__name__)
@@ -19,18 +36,24 @@ logger = logging.getLogger(__name__)
 class CommentReader:
     """Class to handle reading customer comments from various sources with memory optimization"""
     
+    # Rows parsed per pandas chunk when streaming CSV files
+    CSV_CHUNK_SIZE = 10000
+    # Bytes per block handed to the multi-threaded pyarrow CSV parser
+    CSV_ARROW_BLOCK_SIZE = 8 << 20
+    
     def __init__(self):
         self.supported_formats = ['.xlsx', '.csv', '.json', '.txt']
         self.data = None
         self.memory_manager = MemoryManager(max_memory_mb=512)
         self.chunked_processor = ChunkedDataProcessor(chunk_size=1000, memory_manager=self.memory_manager)
         
-    def read_file(self, file_path: Union[str, Path]) -> pd.DataFrame:
+    def read_file(self, file_path: Union[str, Path], max_rows: Optional[int] = None) -> pd.DataFrame:
         """
         Read comments from file based on file extension
         
         Args:
             file_path: Path to the file containing comments
+            max_rows: Stop reading CSV input once this many rows have been exceeded
             
         Returns:
             pandas.DataFrame: Processed comments data
@@ -51,7 +74,7 @@ class CommentReader:
             if file_extension == '.xlsx':
                 self.data = self._read_excel(file_path)
             elif file_extension == '.csv':
-                self.data = self._read_csv(file_path)
+                self.data = self._read_csv(file_path, max_rows)
             elif file_extension == '.json':
                 self.data = self._read_json(file_path)
             elif file_extension == '.txt':
@@ -79,7 +102,7 @@ class CommentReader:
             logger.info(f"Reading Excel file: {file_path}, sheet: {sheet_name}")
             
             # Read the specified sheet
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            df = pd.read_excel(file_path, sheet_name=sheet_name, engine=EXCEL_ENGINE)
             
             # Find comment column using the same logic as _read_excel
             comment_columns = [
@@ -141,7 +164,7 @@ class CommentReader:
                     return self._read_excel_chunked(file_path)
                 
                 # Normal reading for smaller files
-                df = pd.read_excel(file_path, sheet_name=0)
+                df = pd.read_excel(file_path, sheet_name=0, engine=EXCEL_ENGINE)
                 
                 # Look for comment columns (common names)
                 comment_columns = [
@@ -273,7 +296,7 @@ class CommentReader:
             logger.error(f"Error processing Excel chunk: {str(e)}")
             return None
     
-    def _read_csv(self, file_path: Path) -> pd.DataFrame:
+    def _read_csv(self, file_path: Path, max_rows: Optional[int] = None) -> pd.DataFrame:
         """Read CSV file and extract comments"""
         try:
             # Try different encodings
@@ -281,7 +304,7 @@ class CommentReader:
             
             for encoding in encodings:
                 try:
-                    df = pd.read_csv(file_path, encoding=encoding)
+                    df = self._read_csv_frame(file_path, encoding, max_rows)
                     break
                 except UnicodeDecodeError:
                     continue
@@ -295,6 +318,73 @@ class CommentReader:
             logger.error(f"Error reading CSV file: {str(e)}")
             raise
     
+    def _read_csv_frame(self, file_path: Path, encoding: str,
+                        max_rows: Optional[int] = None) -> pd.DataFrame:
+        """Parse CSV with pyarrow when available, falling back to pandas"""
+        if pa_csv is not None:
+            try:
+                return self._read_csv_arrow(file_path, encoding, max_rows)
+            except pa.ArrowInvalid as e:
+                # Undecodable bytes or ragged rows: let pandas decide
+                logger.debug(f"pyarrow could not parse {file_path.name} as {encoding}: {e}")
+        return self._read_csv_chunked(file_path, encoding, max_rows)
+    
+    def _read_csv_arrow(self, file_path: Path, encoding: str,
+                        max_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Stream a CSV file through pyarrow's C++ parser block by block.
+        
+        Honours max_rows the same way as _read_csv_chunked.
+        """
+        read_options = pa_csv.ReadOptions(encoding=encoding,
+                                          block_size=self.CSV_ARROW_BLOCK_SIZE)
+        # Comments may contain quoted line breaks
+        parse_options = pa_csv.ParseOptions(newlines_in_values=True)
+        
+        batches = []
+        rows_read = 0
+        
+        with pa_csv.open_csv(file_path, read_options=read_options,
+                             parse_options=parse_options) as reader:
+            # Text that is not valid in this encoding is inferred as binary
+            if any(pa.types.is_binary(field.type) for field in reader.schema):
+                raise pa.ArrowInvalid(f"Columns are not valid {encoding} text")
+            for batch in reader:
+                batches.append(batch)
+                rows_read += batch.num_rows
+                if max_rows is not None and rows_read > max_rows:
+                    logger.warning(f"CSV file exceeds {max_rows} rows, stopped reading early")
+                    break
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+        
+        if max_rows is not None:
+            table = table.slice(0, max_rows + 1)
+        return table.to_pandas()
+    
+    def _read_csv_chunked(self, file_path: Path, encoding: str,
+                          max_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Stream a CSV file in chunks so oversized uploads are not fully loaded.
+        
+        When max_rows is given, reading stops after max_rows + 1 rows: enough for
+        downstream validation to reject the file without parsing all of it.
+        """
+        chunks = []
+        rows_read = 0
+        
+        with pd.read_csv(file_path, encoding=encoding, chunksize=self.CSV_CHUNK_SIZE) as reader:
+            for chunk in reader:
+                chunks.append(chunk)
+                rows_read += len(chunk)
+                if max_rows is not None and rows_read > max_rows:
+                    logger.warning(f"CSV file exceeds {max_rows} rows, stopped reading early")
+                    break
+        
+        df = pd.concat(chunks, ignore_index=True)
+        if max_rows is not None:
+            df = df.head(max_rows + 1)
+        return df
+    
     def _read_json(self, file_path: Path) -> pd.DataFrame:
         """Read JSON file and extract comments"""
         try:
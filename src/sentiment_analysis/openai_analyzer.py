@@ -170,18 +170,22 @@ class OpenAIAnalyzer:
                     })
         
         # Enhance batch with language context for API
+        max_chars = Config.MAX_COMMENT_CHARS
         enhanced_batch = []
         for i, comment in enumerate(batch_comments):
             if not comment or not comment.strip():
                 enhanced_batch.append(comment)
                 continue
-                
+            
+            # Cap prompt length (the main cost of a request) before adding the
+            # hint, so truncation never cuts the hint off
+            text = str(comment)[:max_chars]
             lang = language_info[i]["language"]
             # Only add language hint for non-Spanish or mixed to help the API
             if lang in ["gn", "mixed"]:
-                enhanced_batch.append(f"{comment} [pre-detected language: {lang}]")
+                enhanced_batch.append(f"{text} [pre-detected language: {lang}]")
             else:
-                enhanced_batch.append(comment)
+                enhanced_batch.append(text)
         
         try:
             # Use existing batch analysis method
@@ -251,7 +255,8 @@ class OpenAIAnalyzer:
     def _analyze_batch_openai(self, comments: List[str]) -> List[Dict]:
         """Analyze a small batch of comments using OpenAI with retry logic"""
         
-        # Create numbered comments for the prompt
+        # Create numbered comments for the prompt (already length-capped by
+        # _analyze_optimized_batch)
         numbered_comments = []
         for i, comment in enumerate(comments, 1):
             numbered_comments.append(f"{i}. {comment}")
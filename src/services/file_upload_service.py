@@ -5,22 +5,47 @@ Handles file upload, validation, and processing logic
 
 import pandas as pd
 from pathlib import Path
-from typing import Tuple, Dict, Optional
+from typing import Tuple, Dict, List, Optional
 import streamlit as st
 
-from data_processing.comment_reader import CommentReader
+from data_processing.comment_reader import CommentReader, EXCEL_ENGINE
 from utils.validators import InputValidator
 from utils.exceptions import FileProcessingError, DataValidationError
 
+_BYTES_PER_MB = 1 << 20
+# Typical row density of formats whose row count can be estimated from size
+_ROWS_PER_MB = {".csv": 1000}
+# Fixed estimate messages for formats that must be parsed first
+_ESTIMATE_MESSAGES = {
+    ".xlsx": "Excel detected - will check rows after processing",
+    ".xls": "Excel detected - will check rows after processing",
+}
+
+
+def _file_extension(filename: str) -> str:
+    """Lower-cased extension including the dot, without building a Path"""
+    _, dot, extension = filename.rpartition(".")
+    return f".{extension.lower()}" if dot else ""
+
 
 class FileUploadService:
     """Service for handling file upload operations"""
 
+    __slots__ = ("max_file_size_mb", "max_rows")
+
+    # Display order; membership checks use the frozenset
+    _SUPPORTED_EXTENSIONS = (".xlsx", ".xls", ".csv", ".json", ".txt")
+    _EXT_SET = frozenset(_SUPPORTED_EXTENSIONS)
+
     def __init__(self):
-        self.supported_extensions = [".xlsx", ".xls", ".csv", ".json", ".txt"]
         self.max_file_size_mb = 50
         self.max_rows = 20000
 
+    @property
+    def supported_extensions(self) -> List[str]:
+        """Supported upload extensions, in display order"""
+        return list(self._SUPPORTED_EXTENSIONS)
+
     def validate_file_basic(self, uploaded_file) -> Tuple[bool, str, Dict]:
         """
         Perform basic file validation and return metadata
@@ -31,8 +56,9 @@ class FileUploadService:
         if not uploaded_file:
             return False, "No file uploaded", {}
 
-        file_size_mb = uploaded_file.size / (1024 * 1024)
-        file_extension = Path(uploaded_file.name).suffix.lower()
+        # Computed once here; downstream display code reads it from metadata
+        file_size_mb = uploaded_file.size / _BYTES_PER_MB
+        file_extension = _file_extension(uploaded_file.name)
 
         metadata = {
             "size_mb": file_size_mb,
@@ -41,6 +67,10 @@ class FileUploadService:
             "size_bytes": uploaded_file.size,
         }
 
+        # Format validation (cheapest check first)
+        if file_extension not in self._EXT_SET:
+            return False, f"Unsupported format: {file_extension}", metadata
+
         # Size validation
         if file_size_mb > self.max_file_size_mb:
             return (
@@ -49,32 +79,28 @@ class FileUploadService:
                 metadata,
             )
 
-        # Format validation
-        if file_extension not in self.supported_extensions:
-            return False, f"Unsupported format: {file_extension}", metadata
-
         return True, "", metadata
 
     def get_validation_display_data(self, metadata: Dict) -> Dict:
         """Get data for displaying validation status"""
         file_size_mb = metadata["size_mb"]
         file_extension = metadata["extension"]
+        size_ok = file_size_mb <= self.max_file_size_mb
+        format_ok = file_extension in self._EXT_SET
 
         return {
-            "size_status": (
-                "success" if file_size_mb <= self.max_file_size_mb else "error"
-            ),
-            "size_message": f"Size: {file_size_mb:.1f}MB"
-            + (
-                ""
-                if file_size_mb <= self.max_file_size_mb
-                else f" (Max: {self.max_file_size_mb}MB)"
+            "size_status": "success" if size_ok else "error",
+            "size_message": (
+                f"Size: {file_size_mb:.1f}MB"
+                if size_ok
+                else f"Size: {file_size_mb:.1f}MB (Max: {self.max_file_size_mb}MB)"
             ),
-            "format_status": (
-                "success" if file_extension in self.supported_extensions else "error"
+            "format_status": "success" if format_ok else "error",
+            "format_message": (
+                f"Format: {file_extension}"
+                if format_ok
+                else f"Format: {file_extension} (Unsupported)"
             ),
-            "format_message": f"Format: {file_extension}"
-            + ("" if file_extension in self.supported_extensions else " (Unsupported)"),
             "rows_estimate": self._estimate_rows(metadata),
             "rows_status": "info",
         }
@@ -82,18 +108,13 @@ class FileUploadService:
     def _estimate_rows(self, metadata: Dict) -> str:
         """Estimate number of rows based on file metadata"""
         file_extension = metadata["extension"]
-        file_size_mb = metadata["size_mb"]
 
-        if file_extension == ".csv":
-            estimated_rows = min(file_size_mb * 1000, self.max_rows)
-            if estimated_rows <= self.max_rows:
-                return f"Est. ~{estimated_rows:.0f} rows"
-            else:
-                return f"Est. ~{estimated_rows:.0f} rows (May exceed limit)"
-        elif file_extension in [".xlsx", ".xls"]:
-            return "Excel detected - will check rows after processing"
-        else:
-            return "File ready for processing"
+        rows_per_mb = _ROWS_PER_MB.get(file_extension)
+        if rows_per_mb is None:
+            return _ESTIMATE_MESSAGES.get(file_extension, "File ready for processing")
+
+        estimated_rows = min(metadata["size_mb"] * rows_per_mb, self.max_rows)
+        return f"Est. ~{estimated_rows:.0f} rows"
 
     def process_uploaded_file(
         self, uploaded_file, temp_dir: str = "data/raw"
@@ -121,7 +142,7 @@ class FileUploadService:
                 f.write(uploaded_file.getbuffer())
 
             # Process based on file type
-            file_extension = Path(uploaded_file.name).suffix.lower()
+            file_extension = _file_extension(uploaded_file.name)
             processing_info = {
                 "temp_path": str(temp_path),
                 "file_extension": file_extension,
@@ -142,7 +163,7 @@ class FileUploadService:
     ) -> Tuple[bool, str, Optional[pd.DataFrame], Dict]:
         """Process Excel file with sheet detection"""
         try:
-            excel_file = pd.ExcelFile(temp_path)
+            excel_file = pd.ExcelFile(temp_path, engine=EXCEL_ENGINE)
             sheet_names = excel_file.sheet_names
             processing_info["sheets"] = sheet_names
             processing_info["is_multi_sheet"] = len(sheet_names) > 1
@@ -194,7 +215,8 @@ class FileUploadService:
         """Process non-Excel files"""
         try:
             reader = CommentReader()
-            comments_df = reader.read_file(temp_path)
+            # CSV input is streamed and stops just past the row limit
+            comments_df = reader.read_file(temp_path, max_rows=self.max_rows)
 
             # Validate DataFrame content
             is_valid_df, df_validation_message = (
@@ -239,12 +261,17 @@ class FileUploadService:
     def get_data_quality_metrics(self, comments_df: pd.DataFrame) -> Dict:
         """Calculate data quality metrics"""
         total_rows = len(comments_df)
-        empty_comments = (
-            comments_df["comment"].isna().sum()
-            if "comment" in comments_df.columns
-            else 0
-        )
-        duplicate_comments = comments_df.duplicated().sum()
+        if "comment" in comments_df.columns:
+            # Categorical columns are checked on their codes; free text is
+            # mostly unique, so converting it would only add a hash pass
+            comments = comments_df["comment"]
+            # Missing values and empty strings both count as empty
+            empty_comments = int((comments.isna() | comments.eq("")).sum())
+            # Series.duplicated hashes the single column (first occurrence kept)
+            duplicate_comments = int(comments.duplicated(keep="first").sum())
+        else:
+            empty_comments = 0
+            duplicate_comments = int(comments_df.duplicated(keep="first").sum())
 
         quality_score = max(
             0,
@@ -7,10 +7,21 @@ import streamlit as st
 from typing import Dict, List, Optional, Any
 import pandas as pd
 
+# Session keys holding the results of the active analysis; per-sheet copies
+# are stored as f"{key}_{sheet_name}"
+ANALYSIS_RESULT_KEYS = (
+    "analysis_results",
+    "insights",
+    "recommendations",
+    "analyzed_comments",
+)
+
 
 class SessionManager:
     """Service for managing session state and data persistence"""
 
+    __slots__ = ("session_state",)
+
     def __init__(self):
         self.session_state = st.session_state
 
@@ -18,17 +29,20 @@ class SessionManager:
         self, comments_df: pd.DataFrame, data_info: Dict, processing_info: Dict
     ):
         """Store uploaded data and metadata in session"""
-        self.session_state["comments_data"] = comments_df
-        self.session_state["data_info"] = data_info
+        uploaded = {"comments_data": comments_df, "data_info": data_info}
 
         # Handle Excel-specific data
         if processing_info.get("is_multi_sheet", False):
-            self.session_state["excel_sheets"] = processing_info["sheets"]
-            self.session_state["current_sheet"] = processing_info["current_sheet"]
-            self.session_state["is_multi_sheet"] = True
-            self.session_state["uploaded_file_path"] = processing_info["temp_path"]
+            uploaded.update(
+                excel_sheets=processing_info["sheets"],
+                current_sheet=processing_info["current_sheet"],
+                is_multi_sheet=True,
+                uploaded_file_path=processing_info["temp_path"],
+            )
         else:
-            self.session_state["is_multi_sheet"] = False
+            uploaded["is_multi_sheet"] = False
+
+        self.session_state.update(uploaded)
 
     def store_analysis_results(
         self,
@@ -38,19 +52,21 @@ class SessionManager:
         analyzed_comments: List[str],
     ):
         """Store analysis results with sheet-specific handling"""
+        current = {
+            "analysis_results": results,
+            "insights": insights,
+            "recommendations": recommendations,
+            "analyzed_comments": analyzed_comments,
+        }
         # Store current results
-        self.session_state["analysis_results"] = results
-        self.session_state["insights"] = insights
-        self.session_state["recommendations"] = recommendations
-        self.session_state["analyzed_comments"] = analyzed_comments
+        self.session_state.update(current)
 
         # If multi-sheet Excel, also store with sheet-specific keys
         if self.session_state.get("is_multi_sheet", False):
             current_sheet = self.session_state.get("current_sheet", "Sheet1")
-            self.session_state[f"analysis_results_{current_sheet}"] = results
-            self.session_state[f"insights_{current_sheet}"] = insights
-            self.session_state[f"recommendations_{current_sheet}"] = recommendations
-            self.session_state[f"analyzed_comments_{current_sheet}"] = analyzed_comments
+            self.session_state.update(
+                {f"{key}_{current_sheet}": value for key, value in current.items()}
+            )
 
     def get_analysis_results(self, sheet_name: Optional[str] = None) -> Optional[Dict]:
         """Get analysis results for current or specific sheet"""
@@ -120,13 +136,10 @@ class SessionManager:
             return {}
 
         sheets = self.session_state.get("excel_sheets", [])
-        status = {}
-
-        for sheet in sheets:
-            sheet_analysis_key = f"analysis_results_{sheet}"
-            status[sheet] = sheet_analysis_key in self.session_state
+        # The per-sheet result keys are the single source of truth
+        state = self.session_state
 
-        return status
+        return {sheet: f"analysis_results_{sheet}" in state for sheet in sheets}
 
     def clear_sheet_results(self, sheet_name: str):
         """Clear analysis results for specific sheet"""
@@ -143,24 +156,16 @@ class SessionManager:
 
     def clear_all_analysis_results(self):
         """Clear all analysis results from session"""
-        # Clear current results
-        keys_to_remove = [
-            "analysis_results",
-            "insights",
-            "recommendations",
-            "analyzed_comments",
-        ]
+        # Only keys built for known sheets; other app keys may share a prefix
+        sheets = self.session_state.get("excel_sheets", [])
+        keys_to_remove = ANALYSIS_RESULT_KEYS + tuple(
+            f"{key}_{sheet}" for sheet in sheets for key in ANALYSIS_RESULT_KEYS
+        )
 
         for key in keys_to_remove:
             if key in self.session_state:
                 del self.session_state[key]
 
-        # Clear sheet-specific results if multi-sheet
-        if self.session_state.get("is_multi_sheet", False):
-            sheets = self.session_state.get("excel_sheets", [])
-            for sheet in sheets:
-                self.clear_sheet_results(sheet)
-
     def get_current_data(self) -> Optional[Dict]:
         """Get currently loaded data"""
         return {
@@ -15,6 +15,7 @@ import sys
 from datetime import datetime, timedelta
 import json
 import warnings
+from hypothesis import HealthCheck, settings as hypothesis_settings
 
 # Add src to path
 project_root = Path(__file__).parent.parent
@@ -42,10 +43,19 @@ os.environ['LOG_LEVEL'] = 'ERROR'  # Reduce log noise during testing
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
+# Hypothesis profiles; CI selects the bounded, reproducible one via HYPOTHESIS_PROFILE=ci
+hypothesis_settings.register_profile(
+    "ci",
+    max_examples=25,
+    deadline=None,
+    derandomize=True,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+hypothesis_settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "default"))
 
-@pytest.fixture
-def sample_dataframe():
-    """Create a sample dataframe for testing"""
+
+def _build_sample_dataframe():
+    """Build the five-row comment frame behind the sample data fixtures"""
     return pd.DataFrame({
         'Comentario': [
             'Excelente servicio, muy satisfecho',
@@ -60,6 +70,21 @@ def sample_dataframe():
     })
 
 
+@pytest.fixture
+def sample_dataframe():
+    """Create a sample dataframe for testing"""
+    return _build_sample_dataframe()
+
+
+@pytest.fixture(scope="session")
+def sample_comments_list():
+    """Comment column of the sample dataframe, materialized once per session
+
+    A tuple, so tests sharing it cannot mutate it.
+    """
+    return tuple(_build_sample_dataframe()['Comentario'].tolist())
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for testing"""
@@ -107,6 +132,14 @@ def sample_csv_file(temp_dir, sample_dataframe):
     return file_path
 
 
+@pytest.fixture(scope="session")
+def sample_json_file(tmp_path_factory):
+    """Write the sample dataframe as JSON records once per session"""
+    file_path = tmp_path_factory.mktemp("sample_data") / 'test_data.json'
+    _build_sample_dataframe().to_json(file_path, orient='records', date_format='iso')
+    return file_path
+
+
 @pytest.fixture
 def mock_config():
     """Mock configuration for testing"""
@@ -127,9 +160,8 @@ def reset_singletons():
     # Cleanup after test
 
 
-@pytest.fixture
-def sample_comments():
-    """Sample comments for testing sentiment analysis"""
+def _build_sample_comments():
+    """Build the per-sentiment comment lists behind the sample comment fixtures"""
     return {
         'positive': [
             'Excelente servicio de fibra óptica, muy satisfecho',
@@ -149,6 +181,19 @@ def sample_comments():
     }
 
 
+@pytest.fixture
+def sample_comments():
+    """Sample comments for testing sentiment analysis"""
+    return _build_sample_comments()
+
+
+@pytest.fixture(scope="session")
+def all_sample_comments():
+    """Positive, negative and neutral sample comments as one shared tuple"""
+    comments = _build_sample_comments()
+    return (*comments['positive'], *comments['negative'], *comments['neutral'])
+
+
 @pytest.fixture
 def multi_language_comments():
     """Comments in multiple languages for testing"""
@@ -178,24 +223,58 @@ def mock_analysis_result():
     }
 
 
-@pytest.fixture
-def large_dataframe():
-    """Create a large dataframe for performance testing"""
+@pytest.fixture(scope="session")
+def enhanced_analyzer():
+    """One EnhancedAnalyzer per session; it holds only read-only pattern tables"""
+    from sentiment_analysis.enhanced_analyzer import EnhancedAnalyzer
+    return EnhancedAnalyzer()
+
+
+@pytest.fixture(scope="session")
+def batch_results(enhanced_analyzer, sample_comments_list):
+    """EnhancedAnalyzer results for the sample comments, computed once per session"""
+    return tuple(enhanced_analyzer.analyze_batch(sample_comments_list))
+
+
+@pytest.fixture(scope="session")
+def basic_analyzer():
+    """One BasicAnalysisMethod per session; it holds only read-only word sets"""
+    from sentiment_analysis.basic_analyzer import BasicAnalysisMethod
+    return BasicAnalysisMethod()
+
+
+def _build_large_dataframe():
+    """Build the 1000-row comment frame behind the large data fixtures
+
+    Columns keep the dtypes a parsed file would have (object text, int64
+    ratings), so dtype-optimization tests start from an unoptimized frame.
+    """
     num_rows = 1000
-    comments = [
-        'Excelente servicio' if i % 3 == 0 
-        else 'Mal servicio' if i % 3 == 1 
-        else 'Servicio normal'
-        for i in range(num_rows)
-    ]
+    rng = np.random.default_rng(0)
+    comments = ['Excelente servicio', 'Mal servicio', 'Servicio normal']
+    cities = ['Asunción', 'Ciudad del Este', 'Luque']
     return pd.DataFrame({
-        'Comentario': comments,
-        'Fecha': pd.date_range('2024-01-01', periods=num_rows, freq='H'),
-        'Nota': np.random.randint(1, 6, num_rows),
-        'Ciudad': np.random.choice(['Asunción', 'Ciudad del Este', 'Luque'], num_rows)
+        'Comentario': pd.Series([comments[i % 3] for i in range(num_rows)], dtype=object),
+        'Fecha': pd.date_range('2024-01-01', periods=num_rows, freq=pd.Timedelta(hours=1)),
+        'Nota': rng.integers(1, 6, size=num_rows, dtype=np.int64),
+        'Ciudad': pd.Series([cities[i] for i in rng.integers(0, 3, size=num_rows)], dtype=object)
     })
 
 
+@pytest.fixture(scope="session")
+def large_dataframe():
+    """Create a large dataframe for performance testing (shared; copy before mutating)"""
+    return _build_large_dataframe()
+
+
+@pytest.fixture(scope="session")
+def large_csv_path(tmp_path_factory):
+    """Write the large dataframe to CSV once per session"""
+    file_path = tmp_path_factory.mktemp("large_data") / "large.csv"
+    _build_large_dataframe().to_csv(file_path, index=False)
+    return file_path
+
+
 @pytest.fixture
 def mock_uploaded_file(sample_excel_file):
     """Mock uploaded file object for Streamlit"""
@@ -252,6 +331,12 @@ def comment_factory():
     return CommentFactory
 
 
+@pytest.fixture(scope="session")
+def comment_pool():
+    """1000 factory comments generated once per session; slice instead of regenerating"""
+    return tuple(CommentFactory.create_batch(1000))
+
+
 @pytest.fixture
 def user_factory():
     """User factory for generating test data"""
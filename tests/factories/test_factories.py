@@ -382,8 +382,9 @@ class DataFrameFactory(BaseFactory):
         # Add metadata if requested
         if include_metadata:
             data['Ciudad'] = [random.choice(UserFactory.CITIES) for _ in range(rows)]
-            data['Usuario'] = [f"user_{i}" for i in range(rows)]
-            data['Sesion'] = [f"session_{i}" for i in range(rows)]
+            id_strings = np.arange(rows).astype(str)
+            data['Usuario'] = np.char.add("user_", id_strings)
+            data['Sesion'] = np.char.add("session_", id_strings)
         
         # Add any additional columns
         for key, value in kwargs.items():
@@ -9,6 +9,12 @@ from unittest.mock import Mock, MagicMock, patch
 import tempfile
 import json
 
+try:
+    import pyarrow as pa
+    import pyarrow.json as paj
+except ImportError:  # pyarrow ships with streamlit, but keep the stdlib path usable
+    pa = paj = None
+
 # Import modules for integration testing
 from services.file_upload_service import FileUploadService
 from services.session_manager import SessionManager
@@ -345,13 +351,22 @@ class TestExportWorkflow:
         # Verify export
         assert json_path.exists()
         
-        # Read back and verify
-        with open(json_path, 'r', encoding='utf-8') as f:
-            loaded_data = json.load(f)
-        
-        assert 'metadata' in loaded_data
-        assert 'results' in loaded_data
-        assert 'summary' in loaded_data
+        # Read back and verify (Arrow's C++ parser, stdlib fallback for other shapes)
+        loaded_keys = None
+        if paj is not None:
+            try:
+                table = paj.read_json(
+                    str(json_path),
+                    parse_options=paj.ParseOptions(newlines_in_values=True)
+                )
+                loaded_keys = set(table.schema.names)
+            except pa.ArrowInvalid:
+                pass
+        if loaded_keys is None:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                loaded_keys = set(json.load(f))
+        
+        assert {'metadata', 'results', 'summary'}.issubset(loaded_keys)
 
 
 class TestSessionManagementWorkflow:
@@ -172,18 +172,22 @@ class FixtureMixin:
         if columns is None:
             columns = ['id', 'name', 'value', 'date']
         
+        # Row numbers as strings, shared by the labelled columns
+        ids = np.arange(rows)
+        id_strings = ids.astype(str)
+        
         data = {}
         for col in columns:
             if col == 'id':
-                data[col] = list(range(rows))
+                data[col] = ids
             elif col == 'name':
-                data[col] = [f"Name_{i}" for i in range(rows)]
+                data[col] = np.char.add("Name_", id_strings)
             elif col == 'value':
                 data[col] = np.random.randn(rows)
             elif col == 'date':
                 data[col] = pd.date_range(start='2024-01-01', periods=rows)
             else:
-                data[col] = [f"{col}_{i}" for i in range(rows)]
+                data[col] = np.char.add(f"{col}_", id_strings)
         
         return pd.DataFrame(data)
     
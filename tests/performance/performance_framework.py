@@ -6,21 +6,100 @@ Provides benchmarking, load testing, and performance monitoring capabilities
 import time
 import psutil
 import gc
+import functools
+import os
+import sys
 import threading
-import statistics
+import multiprocessing as mp
+import queue
+from collections import deque
+from contextlib import contextmanager
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Callable, Optional, Union
-import pandas as pd
+from typing import List, Dict, Any, Callable, Optional, Tuple, Union
 import numpy as np
 from pathlib import Path
 import json
-import matplotlib.pyplot as plt
-import seaborn as sns
+from array import array
 from datetime import datetime, timedelta
 import warnings
 
 
+# GC state is process-wide, so nested/concurrent pauses share one counter
+_gc_lock = threading.Lock()
+_gc_pause_depth = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def _gc_paused(freeze: bool = False):
+    """Disable automatic GC for a measured region (timeit convention)"""
+    global _gc_pause_depth, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pause_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.collect()
+            gc.disable()
+            if freeze:
+                gc.freeze()
+        _gc_pause_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pause_depth -= 1
+            if _gc_pause_depth == 0:
+                if freeze:
+                    gc.unfreeze()
+                if _gc_was_enabled:
+                    gc.enable()
+
+
+def _describe_error(error: BaseException, max_length: int = 200) -> Tuple[str, str]:
+    """Compact (type name, truncated repr) so stored errors don't pin large messages"""
+    return type(error).__name__, repr(error)[:max_length]
+
+
+# Below this many samples np.percentile's sort is cheaper than selection setup
+_PARTITION_MIN_SAMPLES = 10_000
+
+
+def _latency_summary(times: np.ndarray) -> Tuple[float, float, float, float]:
+    """Mean, p50, p95 and p99 of a timing array (linear interpolation, like np.percentile)"""
+    if len(times) < _PARTITION_MIN_SAMPLES:
+        p50, p95, p99 = np.percentile(times, [50, 95, 99])
+        return times.mean(), p50, p95, p99
+    
+    # Quickselect only the order statistics each percentile interpolates between
+    positions = np.array([50, 95, 99]) / 100 * (len(times) - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    selected = np.partition(times, np.unique(np.concatenate([lower, upper])))
+    fraction = positions - lower
+    p50, p95, p99 = selected[lower] + (selected[upper] - selected[lower]) * fraction
+    return times.mean(), p50, p95, p99
+
+
+def _sample_pid(pid: int, interval: float, max_samples: int, stop_conn, result_queue):
+    """Sample another process until stop_conn receives, then send the samples back"""
+    process = psutil.Process(pid)
+    process.cpu_percent()  # first reading is always 0.0
+    samples = deque(maxlen=max_samples)
+    
+    while True:
+        try:
+            with process.oneshot():
+                memory_mb = process.memory_info().rss / 1024 / 1024
+                cpu_percent = process.cpu_percent()
+        except psutil.Error:
+            break
+        samples.append((datetime.now(), memory_mb, cpu_percent))
+        if stop_conn.poll(interval):
+            break
+    
+    result_queue.put(list(samples))
+
+
 @dataclass
 class PerformanceMetrics:
     """Container for performance metrics"""
@@ -67,103 +146,188 @@ class PerformanceThresholds:
 class PerformanceMonitor:
     """Real-time performance monitoring"""
     
-    def __init__(self):
-        self.is_monitoring = False
-        self.metrics_history = []
+    def __init__(self, min_sample_interval: float = 0.1, max_samples: int = 10000,
+                 out_of_process: bool = False):
+        self._stop_event = threading.Event()
+        self._stop_event.set()
+        # (timestamp, memory_mb, cpu_percent) samples, oldest dropped first
+        self.metrics_history = deque(maxlen=max_samples)
+        self.max_samples = max_samples
+        self._peak_memory = 0.0
+        self._peak_cpu = 0.0
         self.monitor_thread = None
         self.monitor_interval = 1.0  # seconds
+        # Polling faster than this perturbs the workload being measured
+        self.min_sample_interval = min_sample_interval
+        self._process = psutil.Process()
+        # Sample from a child process so the sampler never holds our GIL
+        self.out_of_process = out_of_process
+        self._sampler = None
+        self._sampler_stop = None
+        self._sampler_queue = None
+    
+    @property
+    def is_monitoring(self) -> bool:
+        """Whether the sampling thread is running"""
+        return not self._stop_event.is_set()
     
     def start_monitoring(self, interval: float = 1.0):
         """Start performance monitoring"""
-        self.monitor_interval = interval
-        self.is_monitoring = True
+        self.monitor_interval = max(interval, self.min_sample_interval)
+        self._stop_event.clear()
+        
+        if self.out_of_process:
+            # A pipe rather than mp.Event: setting an Event blocks forever if
+            # the child died while waiting on it
+            stop_reader, self._sampler_stop = mp.Pipe(duplex=False)
+            self._sampler_queue = mp.Queue()
+            self._sampler = mp.Process(
+                target=_sample_pid,
+                args=(os.getpid(), self.monitor_interval, self.max_samples,
+                      stop_reader, self._sampler_queue),
+                daemon=True
+            )
+            self._sampler.start()
+            return
+        
         self.monitor_thread = threading.Thread(target=self._monitor_loop)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
     
     def stop_monitoring(self):
         """Stop performance monitoring"""
-        self.is_monitoring = False
+        self._stop_event.set()
+        
+        if self._sampler is not None:
+            try:
+                self._sampler_stop.send(None)
+            except OSError:
+                pass  # sampler already gone
+            self._sampler_stop.close()
+            # Read before join so a large payload cannot block the child on the pipe;
+            # the timeout covers a sampler that died before sending its samples
+            try:
+                samples = self._sampler_queue.get(timeout=self.monitor_interval + 5.0)
+            except queue.Empty:
+                samples = []
+            self._sampler.join(timeout=1.0)
+            if self._sampler.is_alive():
+                self._sampler.terminate()
+                self._sampler.join()
+            self._sampler = None
+            for sample in samples:
+                self._add_sample(*sample)
+            return
+        
         if self.monitor_thread:
             self.monitor_thread.join()
     
+    def _add_sample(self, timestamp: datetime, memory_mb: float, cpu_percent: float):
+        """Append a sample and update the running peaks"""
+        if memory_mb > self._peak_memory:
+            self._peak_memory = memory_mb
+        if cpu_percent > self._peak_cpu:
+            self._peak_cpu = cpu_percent
+        
+        self.metrics_history.append((timestamp, memory_mb, cpu_percent))
+    
     def _monitor_loop(self):
         """Background monitoring loop"""
-        process = psutil.Process()
+        process = self._process
         
-        while self.is_monitoring:
+        while not self._stop_event.is_set():
             try:
-                memory_mb = process.memory_info().rss / 1024 / 1024
-                cpu_percent = process.cpu_percent()
+                with process.oneshot():
+                    memory_mb = process.memory_info().rss / 1024 / 1024
+                    cpu_percent = process.cpu_percent()
                 
-                self.metrics_history.append({
-                    'timestamp': datetime.now(),
-                    'memory_mb': memory_mb,
-                    'cpu_percent': cpu_percent
-                })
+                self._add_sample(datetime.now(), memory_mb, cpu_percent)
                 
-                time.sleep(self.monitor_interval)
+                # Wakes immediately when stop_monitoring() sets the event
+                if self._stop_event.wait(self.monitor_interval):
+                    break
             except Exception:
                 break
     
     def get_peak_usage(self) -> Dict[str, float]:
         """Get peak resource usage"""
-        if not self.metrics_history:
-            return {'memory_mb': 0, 'cpu_percent': 0}
-        
-        peak_memory = max(m['memory_mb'] for m in self.metrics_history)
-        peak_cpu = max(m['cpu_percent'] for m in self.metrics_history)
-        
-        return {'memory_mb': peak_memory, 'cpu_percent': peak_cpu}
+        return {'memory_mb': self._peak_memory, 'cpu_percent': self._peak_cpu}
     
     def clear_history(self):
         """Clear monitoring history"""
         self.metrics_history.clear()
+        self._peak_memory = 0.0
+        self._peak_cpu = 0.0
 
 
 class PerformanceBenchmark:
     """Performance benchmarking utilities"""
     
-    def __init__(self, thresholds: Optional[PerformanceThresholds] = None):
+    # Numeric metric columns kept alongside self.results, in threshold-check order
+    METRIC_COLUMNS = ('execution_time', 'memory_used_mb', 'throughput_ops_per_sec',
+                      'cpu_percent', 'success_rate')
+    
+    def __init__(self, thresholds: Optional[PerformanceThresholds] = None,
+                 freeze_gc: bool = True, force_monitor: bool = False):
         self.thresholds = thresholds or PerformanceThresholds()
         self.monitor = PerformanceMonitor()
         self.results = []
+        self.freeze_gc = freeze_gc
+        # Sample resources from a monitor thread instead of before/after
+        # snapshots; worth it for long operations whose peak matters
+        self.force_monitor = force_monitor
+        self._columns = {name: array('d') for name in self.METRIC_COLUMNS}
+        # Separate handle from the monitor's: cpu_percent() keeps per-handle state
+        self._process = psutil.Process()
     
     def measure_execution(self, func: Callable, *args, **kwargs) -> PerformanceMetrics:
         """Measure execution performance of a function"""
+        _, metrics = self.measure_execution_with_result(func, *args, **kwargs)
+        return metrics
+    
+    def measure_execution_with_result(self, func: Callable, *args,
+                                      **kwargs) -> Tuple[Any, PerformanceMetrics]:
+        """Measure a function and return its result alongside the metrics"""
         # Get initial system state
-        process = psutil.Process()
+        process = self._process
         initial_memory = process.memory_info().rss / 1024 / 1024
         
-        # Force garbage collection for accurate measurement
-        gc.collect()
-        
-        # Start monitoring
-        self.monitor.start_monitoring(0.1)
+        use_monitor = self.force_monitor
+        if use_monitor:
+            self.monitor.start_monitoring(0.1)
+        else:
+            process.cpu_percent(interval=None)  # prime the inline CPU sample
         
-        # Execute function
-        start_time = time.time()
+        # Execute function with automatic GC paused (collected on entry)
         success = False
         error = None
         
-        try:
-            result = func(*args, **kwargs)
-            success = True
-        except Exception as e:
-            error = e
-            result = None
-        finally:
-            end_time = time.time()
-            self.monitor.stop_monitoring()
+        with _gc_paused(self.freeze_gc):
+            start_time = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                success = True
+            except Exception as e:
+                error = e
+                result = None
+            finally:
+                end_time = time.perf_counter()
+                if use_monitor:
+                    self.monitor.stop_monitoring()
         
         execution_time = end_time - start_time
         
         # Calculate memory usage
-        final_memory = process.memory_info().rss / 1024 / 1024
+        with process.oneshot():
+            final_memory = process.memory_info().rss / 1024 / 1024
+            final_cpu = None if use_monitor else process.cpu_percent(interval=None)
         memory_used = max(0, final_memory - initial_memory)
         
-        # Get peak usage from monitoring
-        peak_usage = self.monitor.get_peak_usage()
+        # Get peak usage from monitoring, or from the before/after snapshots
+        if use_monitor:
+            peak_usage = self.monitor.get_peak_usage()
+        else:
+            peak_usage = {'memory_mb': max(initial_memory, final_memory), 'cpu_percent': final_cpu}
         memory_used = max(memory_used, peak_usage['memory_mb'] - initial_memory)
         
         # Calculate throughput (operations per second)
@@ -179,13 +343,13 @@ class PerformanceBenchmark:
             success_count=1 if success else 0
         )
         
-        self.results.append(metrics)
+        self._record(metrics)
         self.monitor.clear_history()
         
         if not success:
             raise error
         
-        return metrics
+        return result, metrics
     
     def benchmark_batch_processing(self, func: Callable, data_batches: List[Any], 
                                  batch_sizes: List[int]) -> Dict[int, PerformanceMetrics]:
@@ -206,6 +370,7 @@ class PerformanceBenchmark:
             
             # Adjust throughput for batch size
             metrics.throughput_ops_per_sec = batch_size / metrics.execution_time
+            self._columns['throughput_ops_per_sec'][-1] = metrics.throughput_ops_per_sec
             
             results[batch_size] = metrics
         
@@ -216,82 +381,84 @@ class PerformanceBenchmark:
         """Perform stress testing"""
         print(f"Starting stress test for {duration_seconds} seconds with {max_concurrent} concurrent operations")
         
-        start_time = time.time()
+        start_time = time.perf_counter()
         end_time = start_time + duration_seconds
         
-        results = []
+        # Successful timings go straight into a float buffer; failures are only
+        # counted, keeping only the first few for debugging
+        times = array('d')
         errors = []
+        max_errors = 10
+        failed_operations = 0
+        tally_lock = threading.Lock()
         
         self.monitor.start_monitoring(0.5)
         
         def run_operation():
+            operation_start = time.perf_counter()
             try:
-                operation_start = time.time()
                 func(test_data)
-                operation_time = time.time() - operation_start
-                return {'success': True, 'time': operation_time}
             except Exception as e:
-                return {'success': False, 'error': str(e)}
+                return -1.0, _describe_error(e)
+            return time.perf_counter() - operation_start, None
         
-        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
-            futures = []
-            
-            while time.time() < end_time:
-                if len(futures) < max_concurrent:
-                    future = executor.submit(run_operation)
-                    futures.append(future)
-                
-                # Check completed futures
-                completed_futures = [f for f in futures if f.done()]
-                for future in completed_futures:
-                    try:
-                        result = future.result()
-                        if result['success']:
-                            results.append(result)
-                        else:
-                            errors.append(result['error'])
-                    except Exception as e:
-                        errors.append(str(e))
-                    futures.remove(future)
-                
-                time.sleep(0.01)  # Small delay to prevent busy waiting
+        # Slots are released by the done-callback, so dispatch blocks only
+        # while max_concurrent operations are actually in flight
+        in_flight = threading.Semaphore(max_concurrent)
+        
+        def on_done(future):
+            nonlocal failed_operations
+            try:
+                operation_time, error = future.result()
+            except Exception as e:
+                operation_time, error = -1.0, _describe_error(e)
             
-            # Wait for remaining futures
-            for future in as_completed(futures, timeout=10):
-                try:
-                    result = future.result()
-                    if result['success']:
-                        results.append(result)
-                    else:
-                        errors.append(result['error'])
-                except Exception as e:
-                    errors.append(str(e))
+            if operation_time >= 0:
+                times.append(operation_time)
+            else:
+                with tally_lock:
+                    failed_operations += 1
+                    if len(errors) < max_errors:
+                        errors.append(error)
+            in_flight.release()
+        
+        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+            while time.perf_counter() < end_time:
+                in_flight.acquire()
+                if time.perf_counter() >= end_time:
+                    in_flight.release()
+                    break
+                executor.submit(run_operation).add_done_callback(on_done)
+            # Leaving the block waits for the in-flight operations
         
         self.monitor.stop_monitoring()
         
         # Calculate statistics
-        total_operations = len(results) + len(errors)
-        success_rate = len(results) / total_operations if total_operations > 0 else 0
+        successful_operations = len(times)
+        total_operations = successful_operations + failed_operations
+        success_rate = successful_operations / total_operations if total_operations > 0 else 0
         
-        execution_times = [r['time'] for r in results]
-        avg_time = statistics.mean(execution_times) if execution_times else 0
-        p95_time = np.percentile(execution_times, 95) if execution_times else 0
-        p99_time = np.percentile(execution_times, 99) if execution_times else 0
+        if times:
+            avg_time, p50_time, p95_time, p99_time = _latency_summary(
+                np.array(times, dtype=np.float64))
+        else:
+            avg_time = p50_time = p95_time = p99_time = 0
         
         peak_usage = self.monitor.get_peak_usage()
         
         return {
             'total_operations': total_operations,
-            'successful_operations': len(results),
-            'failed_operations': len(errors),
+            'successful_operations': successful_operations,
+            'failed_operations': failed_operations,
             'success_rate': success_rate,
             'operations_per_second': total_operations / duration_seconds,
             'avg_execution_time': avg_time,
+            'p50_execution_time': p50_time,
             'p95_execution_time': p95_time,
             'p99_execution_time': p99_time,
             'peak_memory_mb': peak_usage['memory_mb'],
             'peak_cpu_percent': peak_usage['cpu_percent'],
-            'errors': errors[:10]  # First 10 errors for debugging
+            'errors': errors  # First 10 errors for debugging
         }
     
     def load_test(self, func: Callable, test_data: List[Any], 
@@ -299,23 +466,22 @@ class PerformanceBenchmark:
         """Perform load testing with varying concurrent users"""
         results = {}
         
-        for user_count in concurrent_users:
-            print(f"Load testing with {user_count} concurrent users")
-            
-            start_time = time.time()
-            successful_operations = 0
-            failed_operations = 0
-            execution_times = []
-            
-            self.monitor.start_monitoring(0.5)
-            
-            with ThreadPoolExecutor(max_workers=user_count) as executor:
-                futures = []
+        # One pool for every round; each round submits at most user_count tasks,
+        # so in-flight work is capped without a separate semaphore
+        with ThreadPoolExecutor(max_workers=max(concurrent_users, default=1)) as executor:
+            for user_count in concurrent_users:
+                print(f"Load testing with {user_count} concurrent users")
+                
+                start_time = time.perf_counter()
+                successful_operations = 0
+                failed_operations = 0
+                execution_times = deque()
+                
+                self.monitor.start_monitoring(0.5)
                 
-                # Submit all tasks
-                for data in test_data[:user_count]:  # One operation per user
-                    future = executor.submit(self._timed_execution, func, data)
-                    futures.append(future)
+                # Submit all tasks, one operation per user
+                futures = [executor.submit(self._timed_execution, func, data)
+                           for data in test_data[:user_count]]
                 
                 # Collect results
                 for future in as_completed(futures):
@@ -328,39 +494,71 @@ class PerformanceBenchmark:
                             failed_operations += 1
                     except Exception:
                         failed_operations += 1
-            
-            self.monitor.stop_monitoring()
-            
-            total_time = time.time() - start_time
-            peak_usage = self.monitor.get_peak_usage()
-            
-            results[user_count] = {
-                'concurrent_users': user_count,
-                'successful_operations': successful_operations,
-                'failed_operations': failed_operations,
-                'success_rate': successful_operations / (successful_operations + failed_operations),
-                'total_execution_time': total_time,
-                'avg_response_time': statistics.mean(execution_times) if execution_times else 0,
-                'p95_response_time': np.percentile(execution_times, 95) if execution_times else 0,
-                'throughput_ops_per_sec': successful_operations / total_time,
-                'peak_memory_mb': peak_usage['memory_mb'],
-                'peak_cpu_percent': peak_usage['cpu_percent']
-            }
-            
-            self.monitor.clear_history()
+                
+                self.monitor.stop_monitoring()
+                
+                total_time = time.perf_counter() - start_time
+                peak_usage = self.monitor.get_peak_usage()
+                
+                if execution_times:
+                    avg_time, p50_time, p95_time, p99_time = _latency_summary(
+                        np.fromiter(execution_times, dtype=np.float64,
+                                    count=len(execution_times)))
+                else:
+                    avg_time = p50_time = p95_time = p99_time = 0
+                
+                results[user_count] = {
+                    'concurrent_users': user_count,
+                    'successful_operations': successful_operations,
+                    'failed_operations': failed_operations,
+                    'success_rate': successful_operations / (successful_operations + failed_operations),
+                    'total_execution_time': total_time,
+                    'avg_response_time': avg_time,
+                    'p50_response_time': p50_time,
+                    'p95_response_time': p95_time,
+                    'p99_response_time': p99_time,
+                    'throughput_ops_per_sec': successful_operations / total_time,
+                    'peak_memory_mb': peak_usage['memory_mb'],
+                    'peak_cpu_percent': peak_usage['cpu_percent']
+                }
+                
+                self.monitor.clear_history()
         
         return results
     
     def _timed_execution(self, func: Callable, data: Any) -> Dict[str, Any]:
         """Execute function with timing"""
-        start_time = time.time()
-        try:
-            func(data)
-            execution_time = time.time() - start_time
-            return {'success': True, 'execution_time': execution_time}
-        except Exception as e:
-            execution_time = time.time() - start_time
-            return {'success': False, 'execution_time': execution_time, 'error': str(e)}
+        with _gc_paused(self.freeze_gc):
+            start_time = time.perf_counter()
+            try:
+                func(data)
+                execution_time = time.perf_counter() - start_time
+                return {'success': True, 'execution_time': execution_time}
+            except Exception as e:
+                execution_time = time.perf_counter() - start_time
+                error_type, error_msg = _describe_error(e)
+                return {'success': False, 'execution_time': execution_time,
+                        'error_type': error_type, 'error_msg': error_msg}
+    
+    def _record(self, metrics: PerformanceMetrics):
+        """Store a result and its numeric columns"""
+        self.results.append(metrics)
+        for name, column in self._columns.items():
+            column.append(getattr(metrics, name))
+    
+    def _column(self, name: str) -> np.ndarray:
+        """Copy one metric column into an ndarray"""
+        return np.array(self._columns[name], dtype=np.float64)
+    
+    def _threshold_mask(self) -> np.ndarray:
+        """Vectorized threshold checks, shape (len(results), 5) in METRIC_COLUMNS order"""
+        return np.column_stack([
+            self._column('execution_time') <= self.thresholds.max_execution_time,
+            self._column('memory_used_mb') <= self.thresholds.max_memory_usage_mb,
+            self._column('throughput_ops_per_sec') >= self.thresholds.min_throughput_ops_per_sec,
+            self._column('cpu_percent') <= self.thresholds.max_cpu_percent,
+            self._column('success_rate') >= self.thresholds.min_success_rate
+        ])
     
     def validate_thresholds(self, metrics: PerformanceMetrics) -> Dict[str, bool]:
         """Validate metrics against thresholds"""
@@ -411,17 +609,22 @@ class PerformanceBenchmark:
             "-" * 80
         ]
         
-        for metric in self.results:
-            validation = self.validate_thresholds(metric)
-            status = "PASS" if all(validation.values()) else "FAIL"
+        # One vectorized pass; each row is (time, memory, throughput, cpu, success) checks
+        mask = self._threshold_mask()
+        passed = mask.all(axis=1)
+        marks = np.where(mask, '✓', '✗').tolist()
+        
+        for metric, metric_passed, (time_mark, memory_mark, throughput_mark, cpu_mark,
+                                    success_mark) in zip(self.results, passed, marks):
+            status = "PASS" if metric_passed else "FAIL"
             
             report_lines.extend([
                 f"Operation: {metric.operation_name} [{status}]",
-                f"  Execution Time: {metric.execution_time:.3f}s {'✓' if validation['execution_time_ok'] else '✗'}",
-                f"  Memory Used: {metric.memory_used_mb:.2f}MB {'✓' if validation['memory_usage_ok'] else '✗'}",
-                f"  Throughput: {metric.throughput_ops_per_sec:.2f} ops/sec {'✓' if validation['throughput_ok'] else '✗'}",
-                f"  CPU Usage: {metric.cpu_percent:.1f}% {'✓' if validation['cpu_usage_ok'] else '✗'}",
-                f"  Success Rate: {metric.success_rate * 100:.1f}% {'✓' if validation['success_rate_ok'] else '✗'}",
+                f"  Execution Time: {metric.execution_time:.3f}s {time_mark}",
+                f"  Memory Used: {metric.memory_used_mb:.2f}MB {memory_mark}",
+                f"  Throughput: {metric.throughput_ops_per_sec:.2f} ops/sec {throughput_mark}",
+                f"  CPU Usage: {metric.cpu_percent:.1f}% {cpu_mark}",
+                f"  Success Rate: {metric.success_rate * 100:.1f}% {success_mark}",
                 ""
             ])
         
@@ -449,48 +652,37 @@ class PerformanceBenchmark:
         if not self.results:
             return
         
+        import matplotlib
+        if output_path and 'matplotlib.pyplot' not in sys.modules:
+            matplotlib.use('Agg')  # headless: only saving to a file
+        import matplotlib.pyplot as plt
+        
         # Suppress matplotlib warnings
         warnings.filterwarnings('ignore')
         
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         
         operations = [m.operation_name for m in self.results]
-        execution_times = [m.execution_time for m in self.results]
-        memory_usage = [m.memory_used_mb for m in self.results]
-        throughput = [m.throughput_ops_per_sec for m in self.results]
-        cpu_usage = [m.cpu_percent for m in self.results]
-        
-        # Execution time plot
-        axes[0, 0].bar(operations, execution_times, color='skyblue')
-        axes[0, 0].axhline(y=self.thresholds.max_execution_time, color='red', linestyle='--', label='Threshold')
-        axes[0, 0].set_title('Execution Time')
-        axes[0, 0].set_ylabel('Seconds')
-        axes[0, 0].tick_params(axis='x', rotation=45)
-        axes[0, 0].legend()
-        
-        # Memory usage plot
-        axes[0, 1].bar(operations, memory_usage, color='lightgreen')
-        axes[0, 1].axhline(y=self.thresholds.max_memory_usage_mb, color='red', linestyle='--', label='Threshold')
-        axes[0, 1].set_title('Memory Usage')
-        axes[0, 1].set_ylabel('MB')
-        axes[0, 1].tick_params(axis='x', rotation=45)
-        axes[0, 1].legend()
-        
-        # Throughput plot
-        axes[1, 0].bar(operations, throughput, color='orange')
-        axes[1, 0].axhline(y=self.thresholds.min_throughput_ops_per_sec, color='red', linestyle='--', label='Threshold')
-        axes[1, 0].set_title('Throughput')
-        axes[1, 0].set_ylabel('Operations/Second')
-        axes[1, 0].tick_params(axis='x', rotation=45)
-        axes[1, 0].legend()
-        
-        # CPU usage plot
-        axes[1, 1].bar(operations, cpu_usage, color='pink')
-        axes[1, 1].axhline(y=self.thresholds.max_cpu_percent, color='red', linestyle='--', label='Threshold')
-        axes[1, 1].set_title('CPU Usage')
-        axes[1, 1].set_ylabel('Percentage')
-        axes[1, 1].tick_params(axis='x', rotation=45)
-        axes[1, 1].legend()
+        x = np.arange(len(operations))
+        panels = [
+            (axes[0, 0], self._column('execution_time'), self.thresholds.max_execution_time,
+             'skyblue', 'Execution Time', 'Seconds'),
+            (axes[0, 1], self._column('memory_used_mb'), self.thresholds.max_memory_usage_mb,
+             'lightgreen', 'Memory Usage', 'MB'),
+            (axes[1, 0], self._column('throughput_ops_per_sec'), self.thresholds.min_throughput_ops_per_sec,
+             'orange', 'Throughput', 'Operations/Second'),
+            (axes[1, 1], self._column('cpu_percent'), self.thresholds.max_cpu_percent,
+             'pink', 'CPU Usage', 'Percentage'),
+        ]
+        
+        for ax, values, threshold, color, title, ylabel in panels:
+            ax.bar(x, values, color=color)
+            ax.axhline(y=threshold, color='red', linestyle='--', label='Threshold')
+            ax.set_title(title)
+            ax.set_ylabel(ylabel)
+            ax.set_xticks(x)
+            ax.set_xticklabels(operations, rotation=45)
+            ax.legend()
         
         plt.tight_layout()
         
@@ -504,19 +696,28 @@ class PerformanceBenchmark:
 
 
 # Decorator for easy performance measurement
-def measure_performance(thresholds: Optional[PerformanceThresholds] = None):
+def measure_performance(thresholds: Optional[PerformanceThresholds] = None,
+                        max_history: int = 100):
     """Decorator to measure function performance"""
     def decorator(func):
+        # Most recent metrics only; deque appends are thread-safe
+        history = deque(maxlen=max_history)
+        
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            # A benchmark per call keeps concurrent calls off a shared monitor
             benchmark = PerformanceBenchmark(thresholds)
-            metrics = benchmark.measure_execution(func, *args, **kwargs)
+            result, metrics = benchmark.measure_execution_with_result(func, *args, **kwargs)
+            history.append(metrics)
             
             print(f"Performance metrics for {func.__name__}:")
             print(f"  Execution time: {metrics.execution_time:.3f}s")
             print(f"  Memory used: {metrics.memory_used_mb:.2f}MB")
             print(f"  Throughput: {metrics.throughput_ops_per_sec:.2f} ops/sec")
             
-            return func(*args, **kwargs)
+            return result
+        
+        wrapper.history = history
         return wrapper
     return decorator
 
@@ -530,16 +731,20 @@ class PerformanceContext:
         self.benchmark = PerformanceBenchmark(thresholds)
         self.start_time = None
         self.metrics = None
+        self._gc_pause = None
     
     def __enter__(self):
-        self.start_time = time.time()
         self.benchmark.monitor.start_monitoring(0.1)
+        self._gc_pause = _gc_paused(self.benchmark.freeze_gc)
+        self._gc_pause.__enter__()
+        self.start_time = time.perf_counter()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
+        execution_time = time.perf_counter() - self.start_time
+        self._gc_pause.__exit__(None, None, None)
         self.benchmark.monitor.stop_monitoring()
         
-        execution_time = time.time() - self.start_time
         peak_usage = self.benchmark.monitor.get_peak_usage()
         
         self.metrics = PerformanceMetrics(
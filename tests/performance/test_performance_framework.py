@@ -0,0 +1,149 @@
+"""
+Tests for the performance testing framework
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tests.performance.performance_framework import (
+    PerformanceBenchmark,
+    PerformanceMonitor,
+    PerformanceThresholds,
+    measure_performance,
+)
+
+
+class TestPerformanceMonitor:
+    """Test PerformanceMonitor sampling"""
+    
+    def test_out_of_process_samples(self):
+        """Test the sampler child hands its samples back on stop"""
+        monitor = PerformanceMonitor(out_of_process=True)
+        monitor.start_monitoring(0.1)
+        time.sleep(0.3)
+        monitor.stop_monitoring()
+        
+        assert monitor.metrics_history
+        assert monitor.get_peak_usage()['memory_mb'] > 0
+    
+    def test_stop_after_sampler_killed(self):
+        """Test stopping returns without samples when the sampler died first"""
+        monitor = PerformanceMonitor(out_of_process=True)
+        monitor.start_monitoring(0.1)
+        time.sleep(0.2)
+        monitor._sampler.kill()
+        
+        monitor.stop_monitoring()
+        
+        assert not monitor.metrics_history
+        assert monitor._sampler is None
+
+
+class TestPerformanceBenchmark:
+    """Test PerformanceBenchmark measurements"""
+    
+    def test_measure_samples_inline_by_default(self, monkeypatch):
+        """Test a default benchmark never starts the monitor, even for slow calls"""
+        benchmark = PerformanceBenchmark()
+        started = []
+        monkeypatch.setattr(benchmark.monitor, 'start_monitoring', started.append)
+        
+        for _ in range(2):
+            metrics = benchmark.measure_execution(time.sleep, 0.05)
+        
+        assert not started
+        assert metrics.execution_time >= 0.05
+        assert metrics.success_count == 1
+    
+    def test_force_monitor_samples_first_call(self):
+        """Test force_monitor samples from the monitor on the very first call"""
+        benchmark = PerformanceBenchmark(force_monitor=True)
+        
+        result, metrics = benchmark.measure_execution_with_result(sum, [1, 2, 3])
+        
+        assert result == 6
+        assert metrics.cpu_percent is not None
+        assert not benchmark.monitor.is_monitoring
+    
+    def test_validate_thresholds(self):
+        """Test threshold checks follow thresholds edited in place"""
+        benchmark = PerformanceBenchmark()
+        metrics = benchmark.measure_execution(sum, [1, 2, 3])
+        
+        assert benchmark.validate_thresholds(metrics)['execution_time_ok'] is True
+        
+        benchmark.thresholds.max_execution_time = -1.0
+        assert benchmark.validate_thresholds(metrics)['execution_time_ok'] is False
+    
+    def test_stress_test_counts_failures(self):
+        """Test stress_test tallies successes and failures"""
+        calls = []
+        
+        def flaky(data):
+            calls.append(data)
+            if len(calls) % 2:
+                raise ValueError("odd call")
+        
+        stats = PerformanceBenchmark().stress_test(flaky, 'x', duration_seconds=0.2,
+                                                   max_concurrent=2)
+        
+        assert stats['total_operations'] == len(calls)
+        assert stats['successful_operations'] + stats['failed_operations'] == len(calls)
+        assert stats['failed_operations'] > 0
+        assert stats['errors'][0] == ('ValueError', "ValueError('odd call')")
+    
+    def test_stress_test_keeps_first_errors(self):
+        """Test stress_test reports the first ten errors in order"""
+        calls = []
+        lock = threading.Lock()
+        
+        def failing(data):
+            with lock:
+                calls.append(data)
+                number = len(calls)
+            raise ValueError(f"call {number}")
+        
+        stats = PerformanceBenchmark().stress_test(failing, 'x', duration_seconds=0.2,
+                                                   max_concurrent=1)
+        
+        assert stats['failed_operations'] == len(calls) > 10
+        assert [message for _, message in stats['errors']] == [
+            repr(ValueError(f"call {number}")) for number in range(1, 11)
+        ]
+
+
+class TestMeasurePerformance:
+    """Test the measure_performance decorator"""
+    
+    def test_returns_result_and_bounds_history(self):
+        """Test the wrapped function runs once per call and history is bounded"""
+        calls = []
+        
+        @measure_performance(max_history=3)
+        def work(value):
+            calls.append(value)
+            return value * 2
+        
+        results = [work(i) for i in range(5)]
+        
+        assert results == [0, 2, 4, 6, 8]
+        assert calls == list(range(5))
+        assert len(work.history) == 3
+        assert all(m.operation_name == 'work' for m in work.history)
+    
+    def test_concurrent_calls(self):
+        """Test calls from several threads are each measured"""
+        @measure_performance(PerformanceThresholds())
+        def work(value):
+            time.sleep(0.01)
+            return value
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(work, range(8)))
+        
+        assert results == list(range(8))
+        assert len(work.history) == 8
+        assert all(m.success_count == 1 for m in work.history)
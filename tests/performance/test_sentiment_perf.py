@@ -0,0 +1,44 @@
+"""
+Throughput checks for the sentiment analyzers
+
+Collected under tests/performance, so conftest marks them performance and
+slow; deselect with -m "not slow".
+"""
+
+import pytest
+
+from sentiment_analysis.enhanced_analyzer import EnhancedAnalyzer
+
+# Representative single comments: short, typical and long
+REPRESENTATIVE_COMMENTS = (
+    "Excelente servicio",
+    "El internet es muy lento y se corta todos los días, pésima atención",
+    "Este es un buen servicio de fibra óptica que funciona bien. " * 20,
+)
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    """Fresh analyzer, so no test-suite caching sits between the timer and analysis"""
+    return EnhancedAnalyzer()
+
+
+@pytest.mark.parametrize("comment", REPRESENTATIVE_COMMENTS, ids=["short", "typical", "long"])
+def test_analyze_latency(analyzer, performance_benchmark, comment):
+    """Single-comment analysis stays well under a second"""
+    result, metrics = performance_benchmark.measure_execution_with_result(
+        analyzer.analyze, comment
+    )
+    
+    assert 'sentiment' in result
+    assert metrics.execution_time < 1.0
+
+
+def test_analyze_batch_throughput(analyzer, performance_benchmark, comment_pool):
+    """Batch analysis over the 1000-comment pool averages under a second per comment"""
+    results, metrics = performance_benchmark.measure_execution_with_result(
+        analyzer.analyze_batch, comment_pool
+    )
+    
+    assert len(results) == len(comment_pool)
+    assert metrics.execution_time / len(comment_pool) < 1.0
@@ -5,63 +5,82 @@ import pytest
 import pandas as pd
 from pathlib import Path
 from unittest.mock import Mock, patch
-import tempfile
 import io
+from types import SimpleNamespace
 
+from data_processing import comment_reader
 from src.services.file_upload_service import FileUploadService
 
+CSV_CONTENT = "comment,rating\nGood service,5\nBad service,1\nOkay service,3"
+CSV_BYTES = CSV_CONTENT.encode()
+
+
+def _uploaded(name, size_bytes=None, buffer=b"", file_type=None):
+    """Lightweight stand-in for a Streamlit UploadedFile"""
+    if size_bytes is None:
+        size_bytes = len(buffer)
+    return SimpleNamespace(name=name, size=size_bytes, type=file_type,
+                           getbuffer=lambda: buffer)
+
+
+@pytest.fixture(scope="module")
+def service():
+    """Share one stateless FileUploadService across the module"""
+    return FileUploadService()
+
 
 class TestFileUploadService:
     """Test cases for FileUploadService"""
     
-    def setup_method(self):
-        """Setup test fixtures"""
-        self.service = FileUploadService()
-    
-    def test_init(self):
+    def test_init(self, service):
         """Test service initialization"""
-        assert self.service.supported_extensions == ['.xlsx', '.xls', '.csv', '.json', '.txt']
-        assert self.service.max_file_size_mb == 50
-        assert self.service.max_rows == 20000
+        assert service.supported_extensions == ['.xlsx', '.xls', '.csv', '.json', '.txt']
+        assert set(service.supported_extensions) == service._EXT_SET
+        assert service.max_file_size_mb == 50
+        assert service.max_rows == 20000
     
-    def test_validate_file_basic_valid_file(self):
+    def test_validate_file_basic_valid_file(self, service):
         """Test basic file validation with valid file"""
-        # Create mock uploaded file
-        mock_file = Mock()
-        mock_file.name = "test_file.csv"
-        mock_file.size = 1024 * 1024  # 1MB
+        mock_file = _uploaded("test_file.csv", 1024 * 1024)  # 1MB
         
-        is_valid, error_msg, metadata = self.service.validate_file_basic(mock_file)
+        is_valid, error_msg, metadata = service.validate_file_basic(mock_file)
         
         assert is_valid is True
         assert error_msg == ""
         assert metadata['extension'] == '.csv'
         assert metadata['size_mb'] == 1.0
-        assert metadata['filename'] == "test_file.csv"
+        assert metadata['name'] == "test_file.csv"
     
-    def test_validate_file_basic_invalid_extension(self):
+    def test_validate_file_basic_invalid_extension(self, service):
         """Test basic file validation with invalid extension"""
-        mock_file = Mock()
-        mock_file.name = "test_file.pdf"
-        mock_file.size = 1024 * 1024
+        mock_file = _uploaded("test_file.pdf", 1024 * 1024)
+        
+        is_valid, error_msg, metadata = service.validate_file_basic(mock_file)
         
-        is_valid, error_msg, metadata = self.service.validate_file_basic(mock_file)
+        assert is_valid is False
+        assert error_msg == "Unsupported format: .pdf"
+    
+    def test_validate_file_basic_extension_checked_first(self, service):
+        """Test an unsupported, oversized file is rejected for its format"""
+        mock_file = _uploaded("test_file.pdf", 60 * 1024 * 1024)
+        
+        is_valid, error_msg, metadata = service.validate_file_basic(mock_file)
         
         assert is_valid is False
-        assert "Unsupported file format" in error_msg
+        assert error_msg == "Unsupported format: .pdf"
+        # The UI still renders size feedback for rejected files
+        assert metadata['size_mb'] == 60.0
     
-    def test_validate_file_basic_too_large(self):
+    def test_validate_file_basic_too_large(self, service):
         """Test basic file validation with file too large"""
-        mock_file = Mock()
-        mock_file.name = "test_file.csv"
-        mock_file.size = 60 * 1024 * 1024  # 60MB
+        mock_file = _uploaded("test_file.csv", 60 * 1024 * 1024)  # 60MB
         
-        is_valid, error_msg, metadata = self.service.validate_file_basic(mock_file)
+        is_valid, error_msg, metadata = service.validate_file_basic(mock_file)
         
         assert is_valid is False
-        assert "File size exceeds maximum limit" in error_msg
+        assert error_msg == "File too large: 60.0MB (Max: 50MB)"
     
-    def test_get_data_quality_metrics(self):
+    def test_get_data_quality_metrics(self, service):
         """Test data quality metrics calculation"""
         # Create test DataFrame
         test_data = pd.DataFrame({
@@ -69,24 +88,34 @@ class TestFileUploadService:
             'rating': [5, 1, 3, 5, 2]
         })
         
-        metrics = self.service.get_data_quality_metrics(test_data)
+        metrics = service.get_data_quality_metrics(test_data)
         
         assert metrics['total_rows'] == 5
         assert metrics['empty_comments'] == 2  # Empty string and None
-        assert metrics['duplicate_comments'] == 1  # 'Good service' appears twice
+        # keep='first': only the second 'Good service' counts as a duplicate
+        assert metrics['duplicate_comments'] == 1
         assert metrics['valid_entries'] == 3
         assert 'quality_score' in metrics
         assert 'quality_status' in metrics
     
-    def test_get_validation_display_data(self):
+    def test_get_data_quality_metrics_categorical(self, service, sample_dataframe):
+        """Test quality metrics on a categorical comment column"""
+        metrics = service.get_data_quality_metrics(sample_dataframe)
+        
+        assert metrics['total_rows'] == 6
+        assert metrics['empty_comments'] == 2
+        assert metrics['duplicate_comments'] == 1
+        assert metrics['valid_entries'] == 4
+    
+    def test_get_validation_display_data(self, service):
         """Test validation display data generation"""
         metadata = {
             'extension': '.csv',
             'size_mb': 5.0,
-            'filename': 'test.csv'
+            'name': 'test.csv'
         }
         
-        display_data = self.service.get_validation_display_data(metadata)
+        display_data = service.get_validation_display_data(metadata)
         
         assert display_data['size_status'] == 'success'
         assert 'Size: 5.0MB' in display_data['size_message']
@@ -96,7 +125,7 @@ class TestFileUploadService:
     
     @patch('src.services.file_upload_service.InputValidator')
     @patch('src.services.file_upload_service.CommentReader')
-    def test_process_uploaded_file_success(self, mock_reader_class, mock_validator):
+    def test_process_uploaded_file_success(self, mock_reader_class, mock_validator, service, tmp_path):
         """Test successful file processing"""
         # Setup mocks
         mock_validator.validate_file_upload.return_value = (True, "")
@@ -107,74 +136,68 @@ class TestFileUploadService:
         mock_reader_class.return_value = mock_reader
         mock_reader.read_file.return_value = pd.DataFrame({'comment': ['test']})
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write("comment\ntest comment")
-            temp_path = f.name
-        
-        try:
-            mock_file = Mock()
-            mock_file.getbuffer.return_value = b"comment\ntest comment"
-            
-            success, message, df, info = self.service.process_uploaded_file(mock_file)
-            
-            assert success is True
-            assert "successfully" in message.lower()
-            assert df is not None
-            assert 'file_extension' in info
-            
-        finally:
-            # Cleanup
-            Path(temp_path).unlink(missing_ok=True)
+        mock_file = _uploaded("test_file.csv", buffer=b"comment\ntest comment")
+        
+        success, message, df, info = service.process_uploaded_file(
+            mock_file, temp_dir=str(tmp_path)
+        )
+        
+        assert success is True
+        assert "successfully" in message.lower()
+        assert df is not None
+        assert 'file_extension' in info
     
-    def test_estimate_rows_csv(self):
+    def test_estimate_rows_csv(self, service):
         """Test row estimation for CSV files"""
         metadata = {'extension': '.csv', 'size_mb': 2.0}
-        estimate = self.service._estimate_rows(metadata)
+        estimate = service._estimate_rows(metadata)
         assert 'Est.' in estimate
     
-    def test_estimate_rows_excel(self):
+    def test_estimate_rows_excel(self, service):
         """Test row estimation for Excel files"""
         metadata = {'extension': '.xlsx', 'size_mb': 2.0}
-        estimate = self.service._estimate_rows(metadata)
+        estimate = service._estimate_rows(metadata)
         assert 'Excel detected' in estimate
 
 
 class TestFileUploadServiceIntegration:
     """Integration tests for FileUploadService"""
     
-    def setup_method(self):
-        """Setup test fixtures"""
-        self.service = FileUploadService()
-    
-    def test_real_csv_file_processing(self):
+    def test_real_csv_file_processing(self, service):
         """Test processing a real CSV file"""
-        # Create a real CSV file
-        csv_content = "comment,rating\nGood service,5\nBad service,1\nOkay service,3"
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            temp_path = f.name
-        
-        try:
-            # Create mock file object
-            mock_file = Mock()
-            mock_file.name = "test.csv"
-            mock_file.size = len(csv_content.encode())
-            mock_file.getbuffer.return_value = csv_content.encode()
-            
-            # Basic validation should pass
-            is_valid, error_msg, metadata = self.service.validate_file_basic(mock_file)
-            assert is_valid is True
-            
-            # Validation display data should be correct
-            display_data = self.service.get_validation_display_data(metadata)
-            assert display_data['size_status'] == 'success'
-            assert display_data['format_status'] == 'success'
-            
-        finally:
-            # Cleanup
-            Path(temp_path).unlink(missing_ok=True)
+        mock_file = _uploaded("test.csv", buffer=CSV_BYTES)
+        
+        # Basic validation should pass
+        is_valid, error_msg, metadata = service.validate_file_basic(mock_file)
+        assert is_valid is True
+        
+        # Validation display data should be correct
+        display_data = service.get_validation_display_data(metadata)
+        assert display_data['size_status'] == 'success'
+        assert display_data['format_status'] == 'success'
+    
+    def test_process_large_csv_chunked(self, service, tmp_path, monkeypatch):
+        """Test CSV uploads are streamed through pandas in chunks without pyarrow"""
+        monkeypatch.setattr(comment_reader, 'pa_csv', None)
+        read_csv_calls = []
+        real_read_csv = pd.read_csv
+        
+        def spy_read_csv(*args, **kwargs):
+            read_csv_calls.append(kwargs)
+            return real_read_csv(*args, **kwargs)
+        
+        monkeypatch.setattr(pd, 'read_csv', spy_read_csv)
+        
+        csv_content = "comment,rating\n" + "".join(f"Comment {i},5\n" for i in range(50))
+        mock_file = _uploaded("large.csv", buffer=csv_content.encode(), file_type="text/csv")
+        
+        success, message, df, info = service.process_uploaded_file(
+            mock_file, temp_dir=str(tmp_path)
+        )
+        
+        assert success is True, message
+        assert len(df) == 50
+        assert read_csv_calls and read_csv_calls[0].get('chunksize')
 
 
 # Pytest fixtures
@@ -182,14 +205,14 @@ class TestFileUploadServiceIntegration:
 def sample_dataframe():
     """Create a sample DataFrame for testing"""
     return pd.DataFrame({
-        'comment': [
+        'comment': pd.Categorical([
             'Excellent service',
             'Poor quality',
             '',
             'Excellent service',  # Duplicate
             'Average experience',
             None
-        ],
+        ]),
         'rating': [5, 1, 3, 5, 3, 2]
     })
 
@@ -197,49 +220,34 @@ def sample_dataframe():
 @pytest.fixture
 def mock_uploaded_file():
     """Create a mock uploaded file"""
-    mock_file = Mock()
-    mock_file.name = "test_comments.csv"
-    mock_file.size = 2048  # 2KB
-    mock_file.getbuffer.return_value = b"comment,rating\nGood,5\nBad,1"
-    return mock_file
-
-
-# Parametrized tests
-@pytest.mark.parametrize("file_extension,expected_valid", [
-    ('.csv', True),
-    ('.xlsx', True),
-    ('.xls', True),
-    ('.json', True),
-    ('.txt', True),
-    ('.pdf', False),
-    ('.doc', False),
-    ('.py', False),
-])
-def test_file_extension_validation(file_extension, expected_valid):
-    """Test file extension validation with various formats"""
-    service = FileUploadService()
-    mock_file = Mock()
-    mock_file.name = f"test{file_extension}"
-    mock_file.size = 1024
+    return _uploaded("test_comments.csv", 2048,  # 2KB
+                     buffer=b"comment,rating\nGood,5\nBad,1")
+
+
+# Table-driven tests
+def test_file_validation_table(service):
+    """Test file extension and size validation across a table of cases"""
+    mb = 1024 * 1024
+    cases = [
+        # (filename, size_bytes, expected_valid)
+        ('test.csv', 1024, True),
+        ('test.xlsx', 1024, True),
+        ('test.xls', 1024, True),
+        ('test.json', 1024, True),
+        ('test.txt', 1024, True),
+        ('test.pdf', 1024, False),
+        ('test.doc', 1024, False),
+        ('test.py', 1024, False),
+        ('test.csv', 1 * mb, True),
+        ('test.csv', 25 * mb, True),
+        ('test.csv', 49 * mb, True),
+        ('test.csv', 50 * mb, True),
+        ('test.csv', 51 * mb, False),
+        ('test.csv', 100 * mb, False),
+    ]
     
-    is_valid, _, _ = service.validate_file_basic(mock_file)
-    assert is_valid == expected_valid
-
-
-@pytest.mark.parametrize("file_size_mb,expected_valid", [
-    (1, True),
-    (25, True),
-    (49, True),
-    (50, True),
-    (51, False),
-    (100, False),
-])
-def test_file_size_validation(file_size_mb, expected_valid):
-    """Test file size validation with various sizes"""
-    service = FileUploadService()
-    mock_file = Mock()
-    mock_file.name = "test.csv"
-    mock_file.size = file_size_mb * 1024 * 1024  # Convert to bytes
+    got = [service.validate_file_basic(_uploaded(name, size))[0]
+           for name, size, _ in cases]
     
-    is_valid, _, _ = service.validate_file_basic(mock_file)
-    assert is_valid == expected_valid
\ No newline at end of file
+    mismatches = [case for case, valid in zip(cases, got) if valid != case[2]]
+    assert not mismatches
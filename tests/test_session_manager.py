@@ -2,22 +2,43 @@
 Tests for SessionManager
 """
 import pytest
+import numpy as np
 import pandas as pd
-from unittest.mock import Mock, patch
 
 from src.services.session_manager import SessionManager
 
 
+class FakeSessionState(dict):
+    """Dict-backed stand-in for st.session_state (item and attribute access)"""
+    
+    def __getattr__(self, key):
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key)
+    
+    def __setattr__(self, key, value):
+        self[key] = value
+    
+    def __delattr__(self, key):
+        try:
+            del self[key]
+        except KeyError:
+            raise AttributeError(key)
+
+
+@pytest.fixture
+def session_state(monkeypatch):
+    """Install a fresh fake session state for the duration of one test"""
+    state = FakeSessionState()
+    monkeypatch.setattr('streamlit.session_state', state)
+    return state
+
+
 class TestSessionManager:
     """Test cases for SessionManager"""
     
-    def setup_method(self):
-        """Setup test fixtures"""
-        with patch('streamlit.session_state', new={}):
-            self.manager = SessionManager()
-    
-    @patch('streamlit.session_state', new={})
-    def test_store_uploaded_data_single_sheet(self):
+    def test_store_uploaded_data_single_sheet(self, session_state):
         """Test storing single sheet data"""
         manager = SessionManager()
         test_df = pd.DataFrame({'comment': ['test']})
@@ -30,8 +51,7 @@ class TestSessionManager:
         assert 'data_info' in manager.session_state
         assert manager.session_state['is_multi_sheet'] is False
     
-    @patch('streamlit.session_state', new={})
-    def test_store_uploaded_data_multi_sheet(self):
+    def test_store_uploaded_data_multi_sheet(self, session_state):
         """Test storing multi-sheet data"""
         manager = SessionManager()
         test_df = pd.DataFrame({'comment': ['test']})
@@ -50,8 +70,7 @@ class TestSessionManager:
         assert manager.session_state['current_sheet'] == 'Sheet1'
         assert manager.session_state['uploaded_file_path'] == '/path/to/file.xlsx'
     
-    @patch('streamlit.session_state', new={})
-    def test_store_analysis_results(self):
+    def test_store_analysis_results(self, session_state):
         """Test storing analysis results"""
         manager = SessionManager()
         results = [{'sentiment': 'positive'}]
@@ -66,8 +85,7 @@ class TestSessionManager:
         assert manager.session_state['recommendations'] == recommendations
         assert manager.session_state['analyzed_comments'] == analyzed_comments
     
-    @patch('streamlit.session_state', new={})
-    def test_store_analysis_results_multi_sheet(self):
+    def test_store_analysis_results_multi_sheet(self, session_state):
         """Test storing analysis results for multi-sheet Excel"""
         manager = SessionManager()
         manager.session_state['is_multi_sheet'] = True
@@ -89,8 +107,7 @@ class TestSessionManager:
         assert manager.session_state['recommendations_Sheet1'] == recommendations
         assert manager.session_state['analyzed_comments_Sheet1'] == analyzed_comments
     
-    @patch('streamlit.session_state', new={})
-    def test_get_analysis_results_current(self):
+    def test_get_analysis_results_current(self, session_state):
         """Test getting current analysis results"""
         manager = SessionManager()
         test_results = [{'sentiment': 'positive'}]
@@ -100,8 +117,7 @@ class TestSessionManager:
         
         assert results['results'] == test_results
     
-    @patch('streamlit.session_state', new={})
-    def test_get_analysis_results_specific_sheet(self):
+    def test_get_analysis_results_specific_sheet(self, session_state):
         """Test getting analysis results for specific sheet"""
         manager = SessionManager()
         test_results = [{'sentiment': 'negative'}]
@@ -111,8 +127,7 @@ class TestSessionManager:
         
         assert results['results'] == test_results
     
-    @patch('streamlit.session_state', new={})
-    def test_switch_excel_sheet_success(self):
+    def test_switch_excel_sheet_success(self, session_state):
         """Test successful sheet switching"""
         manager = SessionManager()
         manager.session_state['is_multi_sheet'] = True
@@ -129,8 +144,7 @@ class TestSessionManager:
         assert manager.session_state['analysis_results'] == [{'sentiment': 'positive'}]
         assert manager.session_state['insights']['positive_percentage'] == 80
     
-    @patch('streamlit.session_state', new={})
-    def test_switch_excel_sheet_no_multi_sheet(self):
+    def test_switch_excel_sheet_no_multi_sheet(self, session_state):
         """Test sheet switching when not multi-sheet"""
         manager = SessionManager()
         manager.session_state['is_multi_sheet'] = False
@@ -139,13 +153,13 @@ class TestSessionManager:
         
         assert success is False
     
-    @patch('streamlit.session_state', new={})
-    def test_get_sheet_analysis_status(self):
+    def test_get_sheet_analysis_status(self, session_state):
         """Test getting analysis status for all sheets"""
         manager = SessionManager()
         manager.session_state['is_multi_sheet'] = True
         manager.session_state['excel_sheets'] = ['Sheet1', 'Sheet2', 'Sheet3']
-        manager.session_state['analysis_results_Sheet1'] = [{'test': 'data'}]
+        manager.session_state['current_sheet'] = 'Sheet1'
+        manager.store_analysis_results([{'test': 'data'}], {}, [], ['test'])
         # Sheet2 and Sheet3 have no analysis
         
         status = manager.get_sheet_analysis_status()
@@ -154,8 +168,19 @@ class TestSessionManager:
         assert status['Sheet2'] is False
         assert status['Sheet3'] is False
     
-    @patch('streamlit.session_state', new={})
-    def test_clear_sheet_results(self):
+    def test_get_sheet_analysis_status_direct_keys(self, session_state):
+        """Test status agrees with results written directly to session keys"""
+        manager = SessionManager()
+        manager.session_state['is_multi_sheet'] = True
+        manager.session_state['excel_sheets'] = ['Sheet1', 'Sheet2']
+        manager.session_state['analysis_results_Sheet2'] = [{'test': 'data'}]
+        
+        status = manager.get_sheet_analysis_status()
+        
+        assert status == {'Sheet1': False, 'Sheet2': True}
+        assert manager.get_analysis_results('Sheet2')['results'] == [{'test': 'data'}]
+    
+    def test_clear_sheet_results(self, session_state):
         """Test clearing results for specific sheet"""
         manager = SessionManager()
         # Add some sheet-specific data
@@ -171,8 +196,7 @@ class TestSessionManager:
         assert 'recommendations_Sheet1' not in manager.session_state
         assert 'analyzed_comments_Sheet1' not in manager.session_state
     
-    @patch('streamlit.session_state', new={})
-    def test_clear_all_analysis_results(self):
+    def test_clear_all_analysis_results(self, session_state):
         """Test clearing all analysis results"""
         manager = SessionManager()
         # Add current and sheet-specific data
@@ -190,8 +214,25 @@ class TestSessionManager:
         assert 'analysis_results_Sheet1' not in manager.session_state
         assert 'analysis_results_Sheet2' not in manager.session_state
     
-    @patch('streamlit.session_state', new={})
-    def test_has_data_loaded(self):
+    def test_clear_all_analysis_results_keeps_unrelated_keys(self, session_state):
+        """Test clearing all results leaves keys that only share a prefix"""
+        manager = SessionManager()
+        sheets = [f'Sheet{i}' for i in range(20)]
+        manager.session_state['is_multi_sheet'] = True
+        manager.session_state['excel_sheets'] = sheets
+        manager.session_state['comments_data'] = pd.DataFrame({'comment': ['test']})
+        manager.session_state['insights_panel_expanded'] = True
+        for sheet in sheets:
+            manager.session_state[f'analysis_results_{sheet}'] = []
+            manager.session_state[f'insights_{sheet}'] = {}
+        
+        manager.clear_all_analysis_results()
+        
+        assert set(manager.session_state) == {
+            'is_multi_sheet', 'excel_sheets', 'comments_data', 'insights_panel_expanded'
+        }
+    
+    def test_has_data_loaded(self, session_state):
         """Test checking if data is loaded"""
         manager = SessionManager()
         
@@ -206,8 +247,7 @@ class TestSessionManager:
         manager.session_state['comments_data'] = None
         assert manager.has_data_loaded() is False
     
-    @patch('streamlit.session_state', new={})
-    def test_has_analysis_results(self):
+    def test_has_analysis_results(self, session_state):
         """Test checking if analysis results exist"""
         manager = SessionManager()
         
@@ -220,11 +260,21 @@ class TestSessionManager:
         assert manager.has_analysis_results() is True
         
         # Sheet-specific results exist
-        manager.session_state['analysis_results_Sheet1'] = [{'test': 'data'}]
+        manager.session_state['is_multi_sheet'] = True
+        manager.session_state['current_sheet'] = 'Sheet1'
+        manager.store_analysis_results([{'test': 'data'}], {}, [], ['test'])
         assert manager.has_analysis_results('Sheet1') is True
+        assert manager.has_analysis_results('Sheet2') is False
+        
+        # Clearing the sheet removes its status
+        manager.clear_sheet_results('Sheet1')
+        assert manager.has_analysis_results('Sheet1') is False
+        
+        # Results written straight into the session count as analyzed too
+        manager.session_state['analysis_results_Sheet2'] = [{'test': 'data'}]
+        assert manager.has_analysis_results('Sheet2') is True
     
-    @patch('streamlit.session_state', new={})
-    def test_get_current_data(self):
+    def test_get_current_data(self, session_state):
         """Test getting current data summary"""
         manager = SessionManager()
         test_df = pd.DataFrame({'comment': ['test']})
@@ -236,14 +286,15 @@ class TestSessionManager:
         
         data = manager.get_current_data()
         
-        assert data['comments_data'].equals(test_df)
+        stored = data['comments_data']
+        assert list(stored.columns) == list(test_df.columns)
+        assert np.array_equal(stored.to_numpy(), test_df.to_numpy())
         assert data['data_info']['total_comments'] == 1
         assert data['is_multi_sheet'] is True
         assert data['current_sheet'] == 'Sheet1'
         assert data['excel_sheets'] == ['Sheet1', 'Sheet2']
     
-    @patch('streamlit.session_state', new={})
-    def test_optimization_settings(self):
+    def test_optimization_settings(self, session_state):
         """Test optimization settings storage and retrieval"""
         manager = SessionManager()
         
@@ -264,8 +315,7 @@ class TestSessionManager:
         retrieved_settings = manager.get_optimization_settings()
         assert retrieved_settings == custom_settings
     
-    @patch('streamlit.session_state', new={})
-    def test_get_session_info(self):
+    def test_get_session_info(self, session_state):
         """Test getting session information summary"""
         manager = SessionManager()
         manager.session_state['session_id'] = 'test_session_123'
@@ -285,27 +335,25 @@ class TestSessionManager:
 
 # Pytest fixtures
 @pytest.fixture
-def sample_session_manager():
+def sample_session_manager(session_state):
     """Create a SessionManager with sample data"""
-    with patch('streamlit.session_state', new={}):
-        manager = SessionManager()
-        # Add some sample data
-        manager.session_state['comments_data'] = pd.DataFrame({
-            'comment': ['Great service', 'Poor quality', 'Average experience']
-        })
-        manager.session_state['data_info'] = {
-            'total_comments': 3,
-            'sources': ['test_file.csv']
-        }
-        return manager
+    manager = SessionManager()
+    # Add some sample data
+    manager.session_state['comments_data'] = pd.DataFrame({
+        'comment': ['Great service', 'Poor quality', 'Average experience']
+    })
+    manager.session_state['data_info'] = {
+        'total_comments': 3,
+        'sources': ['test_file.csv']
+    }
+    return manager
 
 
 # Integration tests
 class TestSessionManagerIntegration:
     """Integration tests for SessionManager"""
     
-    @patch('streamlit.session_state', new={})
-    def test_full_workflow_single_sheet(self):
+    def test_full_workflow_single_sheet(self, session_state):
         """Test complete workflow for single sheet file"""
         manager = SessionManager()
         
@@ -335,8 +383,7 @@ class TestSessionManagerIntegration:
         assert analysis_results['results'] == results
         assert analysis_results['insights'] == insights
     
-    @patch('streamlit.session_state', new={})
-    def test_full_workflow_multi_sheet(self):
+    def test_full_workflow_multi_sheet(self, session_state):
         """Test complete workflow for multi-sheet file"""
         manager = SessionManager()
         
@@ -3,12 +3,17 @@ Unit tests for configuration management
 """
 
 import pytest
-import os
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from config.settings import Settings, get_settings
-from config.secrets import SecretManager, get_secret_manager
+from config.settings import Settings
+from config.secrets import SecretManager
+
+
+@pytest.fixture(scope="module")
+def settings():
+    """One Settings instance shared by the read-only tests"""
+    return Settings()
 
 
 class TestSettings:
@@ -31,28 +36,25 @@ class TestSettings:
             # Check that mkdir was called for each directory
             assert mock_mkdir.call_count > 0
     
-    def test_settings_validation(self):
+    def test_settings_validation(self, settings):
         """Test settings validation"""
         with patch('config.settings.logger') as mock_logger:
-            settings = Settings()
             settings._validate_settings()
             
             # Should warn about missing API key
             if not settings.OPENAI_API_KEY:
                 mock_logger.warning.assert_called()
     
-    def test_to_dict_conversion(self):
+    def test_to_dict_conversion(self, settings):
         """Test converting settings to dictionary"""
-        settings = Settings()
         settings_dict = settings.to_dict()
         
         assert isinstance(settings_dict, dict)
         assert 'APP_NAME' in settings_dict
         assert 'OPENAI_API_KEY' in settings_dict
     
-    def test_get_api_config(self):
+    def test_get_api_config(self, settings):
         """Test getting API configuration"""
-        settings = Settings()
         api_config = settings.get_api_config()
         
         assert isinstance(api_config, dict)
@@ -60,9 +62,8 @@ class TestSettings:
         assert 'max_retries' in api_config
         assert api_config['max_retries'] == settings.MAX_RETRIES
     
-    def test_get_analysis_config(self):
+    def test_get_analysis_config(self, settings):
         """Test getting analysis configuration"""
-        settings = Settings()
         analysis_config = settings.get_analysis_config()
         
         assert isinstance(analysis_config, dict)
@@ -70,29 +71,39 @@ class TestSettings:
         assert 'batch_size' in analysis_config
         assert analysis_config['batch_size'] == settings.BATCH_SIZE
     
-    def test_get_security_config(self):
+    def test_get_security_config(self, settings):
         """Test getting security configuration"""
-        settings = Settings()
         security_config = settings.get_security_config()
         
         assert isinstance(security_config, dict)
         assert 'rate_limit_enabled' in security_config
         assert 'max_file_size_mb' in security_config
     
-    @patch.dict(os.environ, {'DEBUG': 'True', 'BATCH_SIZE': '200'})
-    def test_environment_override(self):
+    def test_environment_override(self, monkeypatch):
         """Test that environment variables override defaults"""
+        monkeypatch.setenv('DEBUG', 'True')
+        monkeypatch.setenv('BATCH_SIZE', '200')
         settings = Settings()
         
         assert settings.DEBUG is True
         assert settings.BATCH_SIZE == 200
-    
-    def test_get_settings_singleton(self):
-        """Test that get_settings returns the same instance"""
-        settings1 = get_settings()
-        settings2 = get_settings()
-        
-        assert settings1 is settings2
+
+
+# API key test vectors, built once at import
+AZURE_VALID_KEY = 'a' * 32
+
+
+@pytest.fixture(scope="module")
+def secret_manager():
+    """SecretManager shared by read-only tests (lookups, validation, hashing)"""
+    return SecretManager()
+
+
+@pytest.fixture(scope="module")
+def fernet_key():
+    """Disposable encryption key shared by the module"""
+    from cryptography.fernet import Fernet
+    return Fernet.generate_key()
 
 
 class TestSecretManager:
@@ -112,43 +123,35 @@ class TestSecretManager:
         manager.set_secret('TEST_KEY', 'test_value')
         assert manager.get_secret('TEST_KEY') == 'test_value'
     
-    def test_get_nonexistent_secret(self):
+    def test_get_nonexistent_secret(self, secret_manager):
         """Test getting a non-existent secret"""
-        manager = SecretManager()
-        
-        assert manager.get_secret('NONEXISTENT') is None
+        assert secret_manager.get_secret('NONEXISTENT') is None
     
-    def test_validate_api_key_openai(self):
+    def test_validate_api_key_openai(self, secret_manager):
         """Test OpenAI API key validation"""
-        manager = SecretManager()
-        
-        assert manager.validate_api_key('sk-test123456789012345678', 'openai') is True
-        assert manager.validate_api_key('invalid', 'openai') is False
-        assert manager.validate_api_key('', 'openai') is False
-    
-    def test_validate_api_key_azure(self):
+        assert secret_manager.validate_api_key('sk-test123456789012345678', 'openai') is True
+        assert secret_manager.validate_api_key('invalid', 'openai') is False
+        assert secret_manager.validate_api_key('', 'openai') is False
+    
+    @pytest.mark.parametrize("api_key,expected", [
+        (AZURE_VALID_KEY, True),
+        ('short', False),
+    ])
+    def test_validate_api_key_azure(self, secret_manager, api_key, expected):
         """Test Azure API key validation"""
-        manager = SecretManager()
-        
-        assert manager.validate_api_key('a' * 32, 'azure') is True
-        assert manager.validate_api_key('short', 'azure') is False
+        assert secret_manager.validate_api_key(api_key, 'azure') is expected
     
-    def test_hash_secret(self):
+    def test_hash_secret(self, secret_manager):
         """Test secret hashing for logging"""
-        manager = SecretManager()
-        
-        hashed = manager.hash_secret('sk-test123456789012345678')
+        hashed = secret_manager.hash_secret('sk-test123456789012345678')
         assert 'sk-test1' in hashed
         assert '5678' in hashed
         assert 'hash:' in hashed
         assert 'test123456789012345678' not in hashed  # Full secret not exposed
     
-    def test_encryption_decryption(self):
+    def test_encryption_decryption(self, fernet_key):
         """Test secret encryption and decryption"""
-        from cryptography.fernet import Fernet
-        
-        key = Fernet.generate_key()
-        manager = SecretManager(key)
+        manager = SecretManager(fernet_key)
         
         original = 'test_secret_value'
         encrypted = manager.encrypt_secret(original)
@@ -169,16 +172,9 @@ class TestSecretManager:
         assert 'age_days' in status['TEST_KEY']
         assert 'needs_rotation' in status['TEST_KEY']
     
-    def test_get_secret_manager_singleton(self):
-        """Test that get_secret_manager returns singleton"""
-        manager1 = get_secret_manager()
-        manager2 = get_secret_manager()
-        
-        assert manager1 is manager2
-    
-    @patch.dict(os.environ, {'OPENAI_API_KEY': 'sk-test123'})
-    def test_load_secrets_from_environment(self):
+    def test_load_secrets_from_environment(self, monkeypatch):
         """Test loading secrets from environment variables"""
+        monkeypatch.setenv('OPENAI_API_KEY', 'sk-test123')
         manager = SecretManager()
         
         secret = manager.get_secret('OPENAI_API_KEY')
@@ -8,9 +8,9 @@ import numpy as np
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch
 import tempfile
+import zipfile
 
 from data_processing.comment_reader import CommentReader
-from data_processing.language_detector import LanguageDetector
 
 
 class TestCommentReader:
@@ -41,14 +41,46 @@ class TestCommentReader:
         assert len(df) > 0
         assert 'Comentario' in df.columns
     
-    def test_read_json_file(self, temp_dir, sample_dataframe):
-        """Test reading JSON files"""
-        # Create JSON file
-        json_file = temp_dir / 'test.json'
-        sample_dataframe.to_json(json_file, orient='records', date_format='iso')
+    def test_csv_uses_arrow(self, tmp_path, monkeypatch):
+        """Test CSV files are parsed by pyarrow when it is installed"""
+        pa_csv = pytest.importorskip('pyarrow.csv')
+        open_csv_calls = []
+        real_open_csv = pa_csv.open_csv
+        
+        def spy_open_csv(*args, **kwargs):
+            open_csv_calls.append(args)
+            return real_open_csv(*args, **kwargs)
+        
+        monkeypatch.setattr(pa_csv, 'open_csv', spy_open_csv)
+        csv_file = tmp_path / 'comments.csv'
+        csv_file.write_text('comentario,nota\nBuen servicio,5\n"Muy\nlento",2\n', encoding='utf-8')
+        
+        df = CommentReader().read_file(csv_file)
+        
+        assert open_csv_calls
+        assert df['comment'].tolist() == ['Buen servicio', 'Muy\nlento']
+    
+    def test_excel_uses_calamine(self, tmp_path, monkeypatch):
+        """Test Excel sheets are read with the calamine engine when available"""
+        from data_processing import comment_reader
+        read_excel_calls = []
+        
+        def fake_read_excel(*args, **kwargs):
+            read_excel_calls.append(kwargs)
+            return pd.DataFrame({'comentario': ['Buen servicio']})
         
+        monkeypatch.setattr(comment_reader, 'EXCEL_ENGINE', 'calamine')
+        monkeypatch.setattr(pd, 'read_excel', fake_read_excel)
+        
+        df = CommentReader().read_excel_sheet(tmp_path / 'comments.xlsx', 'Sheet1')
+        
+        assert read_excel_calls[0]['engine'] == 'calamine'
+        assert df['comment'].tolist() == ['Buen servicio']
+    
+    def test_read_json_file(self, sample_json_file, sample_dataframe):
+        """Test reading JSON files"""
         reader = CommentReader()
-        df = reader.read_json(str(json_file))
+        df = reader.read_json(str(sample_json_file))
         
         assert isinstance(df, pd.DataFrame)
         assert len(df) == len(sample_dataframe)
@@ -89,10 +121,12 @@ class TestCommentReader:
         reader = CommentReader()
         
         # Add some dirty data
-        dirty_df = sample_dataframe.copy()
-        dirty_df.loc[len(dirty_df)] = {'Comentario': '   ', 'Nota': 3}
-        dirty_df.loc[len(dirty_df)] = {'Comentario': None, 'Nota': 2}
-        dirty_df.loc[len(dirty_df)] = {'Comentario': '', 'Nota': 1}
+        dirty_rows = pd.DataFrame([
+            {'Comentario': '   ', 'Nota': 3},
+            {'Comentario': None, 'Nota': 2},
+            {'Comentario': '', 'Nota': 1},
+        ])
+        dirty_df = pd.concat([sample_dataframe, dirty_rows], ignore_index=True)
         
         cleaned_df = reader.clean_comments(dirty_df)
         
@@ -113,114 +147,125 @@ class TestCommentReader:
         result = reader.read_csv(str(latin1_file))
         assert result is not None
     
-    def test_handle_large_file(self, large_dataframe, temp_dir):
+    def test_handle_large_file(self, large_dataframe, large_csv_path):
         """Test handling large files"""
         reader = CommentReader()
         
-        # Save large dataframe
-        large_file = temp_dir / 'large.xlsx'
-        large_dataframe.to_excel(large_file, index=False)
-        
-        # Should handle large file
-        df = reader.read_excel(str(large_file))
+        # Columnar CSV parsing keeps the large fixture cheap; Excel is
+        # covered by the smoke test below
+        df = reader.read_file(large_csv_path)
         assert isinstance(df, pd.DataFrame)
         assert len(df) == len(large_dataframe)
     
+    def test_read_excel_format_smoke(self, sample_excel_file, sample_dataframe):
+        """Test the Excel path end to end on a small workbook"""
+        reader = CommentReader()
+        
+        df = reader.read_file(sample_excel_file)
+        
+        assert df['comment'].tolist() == sample_dataframe['Comentario'].tolist()
+        assert (df['source'] == 'excel').all()
+    
     def test_error_handling(self, temp_dir):
         """Test error handling for invalid files"""
         reader = CommentReader()
         
         # Non-existent file
-        with pytest.raises(Exception):
-            reader.read_excel('non_existent_file.xlsx')
+        with pytest.raises((FileNotFoundError, OSError)):
+            reader.read_file('non_existent_file.xlsx')
         
         # Corrupted file
         corrupted_file = temp_dir / 'corrupted.xlsx'
         corrupted_file.write_text('This is not an Excel file')
         
-        with pytest.raises(Exception):
-            reader.read_excel(str(corrupted_file))
+        with pytest.raises((ValueError, zipfile.BadZipFile, OSError)):
+            reader.read_file(str(corrupted_file))
+
+
+# Detector test inputs, built once at import
+_SPANISH_TEXTS = (
+    "Este es un texto en español",
+    "Buenos días, ¿cómo está usted?",
+    "El servicio de internet es excelente",
+)
+_ENGLISH_TEXTS = (
+    "This is an English text",
+    "Hello, how are you?",
+    "The internet service is great",
+)
+_GUARANI_TEXTS = (
+    "Mba'éichapa",
+    "Iporãite",
+    "Che rohayhu",
+)
+_CLEAR_SPANISH_TEXTS = (
+    "Este es definitivamente un texto en español",
+    "El servicio de fibra óptica funciona muy bien en mi casa",
+    "La atención al cliente fue rápida y muy amable",
+    "Estoy contento con la velocidad de la conexión",
+    "Me gustaría que el precio del plan fuera más bajo",
+)
+_SHORT_TEXTS = ("Hola", "OK", "Si", "No")
+_EMPTY_TEXTS = ("", "   ", None, "\n\t")
+_SPECIAL_TEXTS = ("¡Hola! ¿Cómo estás?", "@usuario #hashtag", "😀😃😄", "123456789")
+
+# (text, accepted languages); Guaraní might be detected as unknown or 'gn'
+_LANGUAGE_CASES = (
+    [pytest.param(text, {'es'}, id=f'es-{i}') for i, text in enumerate(_SPANISH_TEXTS)]
+    + [pytest.param(text, {'en'}, id=f'en-{i}') for i, text in enumerate(_ENGLISH_TEXTS)]
+    + [pytest.param(text, {'gn', 'unknown', 'es'}, id=f'gn-{i}')
+       for i, text in enumerate(_GUARANI_TEXTS)]
+)
+
+
+@pytest.fixture(scope="module")
+def detector():
+    """Build the language detector once for the whole module"""
+    # Imported here so runs that deselect detector tests skip langdetect
+    from data_processing.language_detector import LanguageDetector
+    return LanguageDetector()
 
 
 class TestLanguageDetector:
     """Test LanguageDetector class"""
     
-    def test_initialization(self):
+    def test_initialization(self, detector):
         """Test LanguageDetector initialization"""
-        detector = LanguageDetector()
         assert detector is not None
         assert hasattr(detector, 'detect')
     
-    def test_detect_spanish(self):
-        """Test Spanish language detection"""
-        detector = LanguageDetector()
-        
-        spanish_texts = [
-            "Este es un texto en español",
-            "Buenos días, ¿cómo está usted?",
-            "El servicio de internet es excelente"
-        ]
-        
-        for text in spanish_texts:
-            lang = detector.detect(text)
-            assert lang == 'es'
-    
-    def test_detect_guarani(self):
-        """Test Guaraní language detection"""
-        detector = LanguageDetector()
-        
-        guarani_texts = [
-            "Mba'éichapa",
-            "Iporãite",
-            "Che rohayhu"
-        ]
-        
-        for text in guarani_texts:
-            lang = detector.detect(text)
-            # Guaraní might be detected as unknown or 'gn'
-            assert lang in ['gn', 'unknown', 'es'] or True
+    @pytest.mark.parametrize("text,expected", _LANGUAGE_CASES)
+    def test_detect_language(self, detector, text, expected):
+        """Test Spanish, English and Guaraní detection"""
+        assert detector.detect(text) in expected
     
-    def test_detect_english(self):
-        """Test English language detection"""
-        detector = LanguageDetector()
-        
-        english_texts = [
-            "This is an English text",
-            "Hello, how are you?",
-            "The internet service is great"
-        ]
-        
-        for text in english_texts:
-            lang = detector.detect(text)
-            assert lang == 'en'
-    
-    def test_detect_mixed_language(self, multi_language_comments):
+    def test_detect_mixed_language(self, detector, multi_language_comments):
         """Test mixed language detection"""
-        detector = LanguageDetector()
-        
         mixed_text = multi_language_comments['mixed']
         lang = detector.detect(mixed_text)
         
         # Mixed text might be detected as primary language
         assert lang in ['es', 'gn', 'mixed', 'unknown']
     
-    def test_detect_batch(self, sample_comments):
+    def test_detect_batch(self, detector, sample_comments):
         """Test batch language detection"""
-        detector = LanguageDetector()
-        
         all_comments = sample_comments['positive'] + sample_comments['negative']
         languages = detector.detect_batch(all_comments)
         
         assert len(languages) == len(all_comments)
         assert all(isinstance(lang, str) for lang in languages)
     
-    def test_confidence_scores(self):
+    def test_confidence_scores(self, detector):
         """Test language detection confidence scores"""
-        detector = LanguageDetector()
-        
         # Clear Spanish text should have high confidence
-        clear_spanish = "Este es definitivamente un texto en español"
-        result = detector.detect_with_confidence(clear_spanish)
+        if hasattr(detector, 'detect_with_confidence_batch'):
+            # One call scores every variant
+            results = detector.detect_with_confidence_batch(_CLEAR_SPANISH_TEXTS)
+            assert [lang for lang, _ in results] == ['es'] * len(_CLEAR_SPANISH_TEXTS)
+            assert all(confidence > 0.7 for _, confidence in results)
+            return
+        
+        result = detector.detect_with_confidence(_CLEAR_SPANISH_TEXTS[0])
         
         if isinstance(result, tuple):
             lang, confidence = result
@@ -230,43 +275,21 @@ class TestLanguageDetector:
             # Simple detection without confidence
             assert result == 'es'
     
-    def test_short_text_detection(self):
+    def test_short_text_detection(self, detector):
         """Test detection with short texts"""
-        detector = LanguageDetector()
-        
-        short_texts = [
-            "Hola",
-            "OK",
-            "Si",
-            "No"
-        ]
-        
-        for text in short_texts:
+        for text in _SHORT_TEXTS:
             lang = detector.detect(text)
             assert lang is not None
     
-    def test_empty_text_detection(self):
+    def test_empty_text_detection(self, detector):
         """Test detection with empty texts"""
-        detector = LanguageDetector()
-        
-        empty_texts = ["", "   ", None, "\n\t"]
-        
-        for text in empty_texts:
+        for text in _EMPTY_TEXTS:
             lang = detector.detect(text)
             assert lang in ['unknown', 'none', ''] or lang is None
     
-    def test_special_characters(self):
+    def test_special_characters(self, detector):
         """Test detection with special characters"""
-        detector = LanguageDetector()
-        
-        special_texts = [
-            "¡Hola! ¿Cómo estás?",
-            "@usuario #hashtag",
-            "😀😃😄",
-            "123456789"
-        ]
-        
-        for text in special_texts:
+        for text in _SPECIAL_TEXTS:
             lang = detector.detect(text)
             assert lang is not None
 
@@ -292,10 +315,8 @@ class TestDataValidation:
         # Check comment column is string
         assert sample_dataframe['Comentario'].dtype == 'object'
         
-        # Check date column is datetime
+        # Check date column is datetime (the fixture builds it with date_range)
         if 'Fecha' in sample_dataframe.columns:
-            # Convert to datetime if needed
-            sample_dataframe['Fecha'] = pd.to_datetime(sample_dataframe['Fecha'])
             assert pd.api.types.is_datetime64_any_dtype(sample_dataframe['Fecha'])
         
         # Check rating column is numeric
@@ -315,8 +336,9 @@ class TestDataValidation:
         """Test duplicate removal"""
         reader = CommentReader()
         
-        # Add duplicates
-        df_with_dups = pd.concat([sample_dataframe, sample_dataframe])
+        # Add duplicates with a single gather of every row twice
+        row_positions = np.tile(np.arange(len(sample_dataframe)), 2)
+        df_with_dups = sample_dataframe.take(row_positions)
         
         # Remove duplicates
         df_clean = reader.remove_duplicates(df_with_dups)
@@ -361,12 +383,13 @@ class TestDataTransformation:
         """Test adding derived columns"""
         reader = CommentReader()
         
+        # sample_dataframe is built fresh per test, so in-place edits are harmless
         # Add comment length column
-        df_enhanced = reader.add_comment_length(sample_dataframe.copy())
+        df_enhanced = reader.add_comment_length(sample_dataframe)
         assert 'comment_length' in df_enhanced.columns or True
         
         # Add word count column
-        df_enhanced = reader.add_word_count(sample_dataframe.copy())
+        df_enhanced = reader.add_word_count(sample_dataframe)
         assert 'word_count' in df_enhanced.columns or True
     
     def test_batch_processing(self, large_dataframe):
@@ -384,6 +407,15 @@ class TestDataTransformation:
         assert total_processed == len(large_dataframe) or True
 
 
+def _memory_bytes(df):
+    """Frame size in bytes, walking Python objects only when object columns exist"""
+    deep = any(
+        dtype.kind == 'O' and not isinstance(dtype, pd.CategoricalDtype)
+        for dtype in df.dtypes
+    )
+    return df.memory_usage(deep=deep).sum()
+
+
 class TestMemoryOptimization:
     """Test memory optimization features"""
     
@@ -392,34 +424,29 @@ class TestMemoryOptimization:
         reader = CommentReader()
         
         # Get memory usage before
-        memory_before = large_dataframe.memory_usage(deep=True).sum()
+        memory_before = _memory_bytes(large_dataframe)
         
         # Optimize dtypes
-        df_optimized = reader.optimize_dtypes(large_dataframe)
+        df_optimized = reader.optimize_dtypes(large_dataframe.copy())
         
         # Get memory usage after
-        memory_after = df_optimized.memory_usage(deep=True).sum()
+        memory_after = _memory_bytes(df_optimized)
         
         # Memory should be same or less
         assert memory_after <= memory_before or True
     
-    def test_chunked_reading(self, temp_dir, large_dataframe):
+    def test_chunked_reading(self, large_dataframe, large_csv_path):
         """Test chunked file reading"""
         reader = CommentReader()
         
-        # Save large file
-        large_file = temp_dir / 'large.csv'
-        large_dataframe.to_csv(large_file, index=False)
-        
-        # Read in chunks
+        # Read in chunks, keeping only a running count
         chunk_size = 100
-        chunks = []
-        for chunk in reader.read_csv_chunks(str(large_file), chunk_size):
+        total_rows = 0
+        for chunk in reader.read_csv_chunks(str(large_csv_path), chunk_size):
             assert len(chunk) <= chunk_size
-            chunks.append(chunk)
+            total_rows += len(chunk)
         
         # Verify all data was read
-        total_rows = sum(len(chunk) for chunk in chunks)
         assert total_rows == len(large_dataframe) or True
     
     def test_memory_limit_handling(self, large_dataframe):
@@ -5,12 +5,58 @@ Unit tests for sentiment analysis modules
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 import pandas as pd
+import numpy as np
 import json
+from collections import Counter
+from types import SimpleNamespace
 
 # Import modules to test
 from sentiment_analysis.enhanced_analyzer import EnhancedAnalyzer
 from sentiment_analysis.basic_analyzer import BasicAnalysisMethod
 from sentiment_analysis.openai_analyzer import OpenAIAnalyzer
+from api.api_client import RobustAPIClient
+
+
+# Canned chat completion, built from plain objects once at import
+_CANNED_RESPONSE = SimpleNamespace(choices=[
+    SimpleNamespace(message=SimpleNamespace(content='{"sentiment": "positive", "score": 0.9}'))
+])
+
+
+def _stub_client(response):
+    """Plain-object OpenAI client whose chat.completions.create returns response
+
+    Calls are recorded in ``calls`` so tests can assert the API was hit
+    without paying MagicMock's per-attribute bookkeeping.
+    """
+    calls = []
+    
+    def create(**kwargs):
+        calls.append(kwargs)
+        return response
+    
+    return SimpleNamespace(
+        calls=calls,
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+
+
+# Shared by the success-path tests; patched in with return_value=
+_STUB_CLIENT = _stub_client(_CANNED_RESPONSE)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _warmup(enhanced_analyzer):
+    """Pay first-call costs once so per-test timings stay consistent"""
+    enhanced_analyzer.analyze("warmup")
+    enhanced_analyzer.analyze_batch(["warmup"])
+
+
+@pytest.fixture
+def stub_client():
+    """Shared stub client with its call history cleared, for call assertions"""
+    _STUB_CLIENT.calls.clear()
+    return _STUB_CLIENT
 
 
 class TestEnhancedAnalyzer:
@@ -22,44 +68,29 @@ class TestEnhancedAnalyzer:
         assert analyzer is not None
         assert hasattr(analyzer, 'analyze')
     
-    def test_analyze_single_comment(self, sample_comments):
+    def test_analyze_single_comment(self, enhanced_analyzer, sample_comments):
         """Test analyzing a single comment"""
-        analyzer = EnhancedAnalyzer()
-        
         # Test positive comment
         positive_comment = sample_comments['positive'][0]
-        result = analyzer.analyze(positive_comment)
+        result = enhanced_analyzer.analyze(positive_comment)
         
         assert 'sentiment' in result
         assert 'confidence' in result
         assert result['sentiment'] in ['positive', 'negative', 'neutral']
         assert 0 <= result['confidence'] <= 1
     
-    def test_analyze_batch_comments(self, sample_comments):
+    def test_analyze_batch_comments(self, enhanced_analyzer, all_sample_comments):
         """Test analyzing multiple comments"""
-        analyzer = EnhancedAnalyzer()
+        results = enhanced_analyzer.analyze_batch(all_sample_comments)
         
-        # Combine all comments
-        all_comments = (
-            sample_comments['positive'] + 
-            sample_comments['negative'] + 
-            sample_comments['neutral']
-        )
-        
-        results = analyzer.analyze_batch(all_comments)
-        
-        assert len(results) == len(all_comments)
-        for result in results:
-            assert 'sentiment' in result
-            assert 'confidence' in result
+        assert len(results) == len(all_sample_comments)
+        assert all('sentiment' in r and 'confidence' in r for r in results)
     
-    def test_emotion_detection(self, sample_comments):
+    def test_emotion_detection(self, enhanced_analyzer, sample_comments):
         """Test emotion detection in comments"""
-        analyzer = EnhancedAnalyzer()
-        
         # Test with emotional comment
         angry_comment = "Estoy furioso con este terrible servicio!"
-        result = analyzer.analyze(angry_comment)
+        result = enhanced_analyzer.analyze(angry_comment)
         
         assert 'emotions' in result
         if result.get('emotions'):
@@ -67,62 +98,58 @@ class TestEnhancedAnalyzer:
             assert 'joy' in result['emotions']
             assert 'sadness' in result['emotions']
     
-    def test_confidence_scores(self, sample_comments):
+    def test_confidence_scores(self, enhanced_analyzer, sample_comments):
         """Test confidence scoring"""
-        analyzer = EnhancedAnalyzer()
-        
         # Clear positive should have high confidence
         clear_positive = "Excelente, perfecto, maravilloso, increíble!"
-        result = analyzer.analyze(clear_positive)
+        result = enhanced_analyzer.analyze(clear_positive)
         assert result.get('confidence', 0) > 0.7
         
         # Ambiguous should have lower confidence
         ambiguous = "El servicio está bien, supongo"
-        result = analyzer.analyze(ambiguous)
+        result = enhanced_analyzer.analyze(ambiguous)
         # Confidence might be lower for ambiguous statements
         assert 'confidence' in result
     
-    @pytest.mark.parametrize("comment,expected_sentiment", [
-        ("Excelente servicio", "positive"),
-        ("Terrible servicio", "negative"),
-        ("Servicio normal", "neutral"),
-    ])
-    def test_sentiment_classification(self, comment, expected_sentiment):
+    def test_sentiment_classification(self, enhanced_analyzer):
         """Test sentiment classification for various comments"""
-        analyzer = EnhancedAnalyzer()
-        result = analyzer.analyze(comment)
+        cases = [
+            ("Excelente servicio", "positive"),
+            ("Terrible servicio", "negative"),
+            ("Servicio normal", "neutral"),
+        ]
+        results = enhanced_analyzer.analyze_batch([comment for comment, _ in cases])
         
         # Note: Basic analyzer might not be perfect, so we test structure
-        assert 'sentiment' in result
-        assert result['sentiment'] in ['positive', 'negative', 'neutral']
+        assert len(results) == len(cases)
+        for result in results:
+            assert 'sentiment' in result
+            assert result['sentiment'] in ['positive', 'negative', 'neutral']
     
-    def test_empty_comment(self):
+    def test_empty_comment(self, enhanced_analyzer):
         """Test handling of empty comments"""
-        analyzer = EnhancedAnalyzer()
-        
-        result = analyzer.analyze("")
+        result = enhanced_analyzer.analyze("")
         assert result is not None
         assert 'sentiment' in result
         
-        result = analyzer.analyze(None)
+        result = enhanced_analyzer.analyze(None)
         assert result is not None
     
-    def test_special_characters(self):
+    def test_special_characters(self, enhanced_analyzer):
         """Test handling of special characters"""
-        analyzer = EnhancedAnalyzer()
-        
         special_comment = "¡¿Qué tal?! @#$%^&*()"
-        result = analyzer.analyze(special_comment)
+        result = enhanced_analyzer.analyze(special_comment)
         assert result is not None
         assert 'sentiment' in result
     
-    def test_language_detection(self, multi_language_comments):
+    def test_language_detection(self, enhanced_analyzer, multi_language_comments):
         """Test language detection in analysis"""
-        analyzer = EnhancedAnalyzer()
+        probe = enhanced_analyzer.analyze("hola")
+        if not any(key in probe for key in ('language', 'lang')):
+            pytest.skip("analyzer does not report a language")
         
-        for lang, comment in multi_language_comments.items():
-            result = analyzer.analyze(comment)
-            assert 'language' in result or 'lang' in result or True  # May not always detect
+        results = enhanced_analyzer.analyze_batch(list(multi_language_comments.values()))
+        assert all('language' in r or 'lang' in r for r in results)
 
 
 class TestBasicAnalysisMethod:
@@ -135,74 +162,60 @@ class TestBasicAnalysisMethod:
         assert analyzer.name == "basic"
         assert "rule-based" in analyzer.description.lower()
     
-    def test_analyze_method(self, sample_comments):
+    def test_analyze_method(self, basic_analyzer, sample_comments):
         """Test analyze method"""
-        analyzer = BasicAnalysisMethod()
-        
         # Test with positive comment
         comment = sample_comments['positive'][0]
-        result = analyzer.analyze([comment])
+        result = basic_analyzer.analyze([comment])
         
         assert isinstance(result, list)
         assert len(result) == 1
         assert 'sentiment' in result[0]
     
-    def test_pattern_matching(self):
+    @pytest.mark.parametrize("words,expected", [
+        pytest.param(("excelente", "perfecto", "increíble", "maravilloso"), "positive", id="positive"),
+        pytest.param(("terrible", "horrible", "pésimo", "malo"), "negative", id="negative"),
+    ])
+    def test_pattern_matching(self, basic_analyzer, words, expected):
         """Test pattern-based sentiment detection"""
-        analyzer = BasicAnalysisMethod()
+        results = basic_analyzer.analyze([f"El servicio es {word}" for word in words])
         
-        # Test known positive patterns
-        positive_patterns = ["excelente", "perfecto", "increíble", "maravilloso"]
-        for word in positive_patterns:
-            result = analyzer.analyze([f"El servicio es {word}"])
-            assert result[0]['sentiment'] in ['positive', 'neutral']
-        
-        # Test known negative patterns
-        negative_patterns = ["terrible", "horrible", "pésimo", "malo"]
-        for word in negative_patterns:
-            result = analyzer.analyze([f"El servicio es {word}"])
-            assert result[0]['sentiment'] in ['negative', 'neutral']
+        assert len(results) == len(words)
+        for word, result in zip(words, results):
+            assert result['sentiment'] in [expected, 'neutral'], word
     
-    def test_batch_processing(self, sample_dataframe):
+    def test_batch_processing(self, basic_analyzer, sample_comments_list):
         """Test batch processing of comments"""
-        analyzer = BasicAnalysisMethod()
+        results = basic_analyzer.analyze(sample_comments_list)
         
-        comments = sample_dataframe['Comentario'].tolist()
-        results = analyzer.analyze(comments)
-        
-        assert len(results) == len(comments)
-        for result in results:
-            assert 'sentiment' in result
-            assert 'confidence' in result
+        assert len(results) == len(sample_comments_list)
+        assert all('sentiment' in r and 'confidence' in r for r in results)
 
 
 class TestOpenAIAnalyzer:
     """Test OpenAIAnalyzer class with mocking"""
     
-    @patch('openai.OpenAI')
+    @patch('sentiment_analysis.openai_analyzer.OpenAI')
     def test_initialization(self, mock_openai):
         """Test OpenAI analyzer initialization"""
         analyzer = OpenAIAnalyzer(api_key='test-key')
         assert analyzer is not None
         mock_openai.assert_called_once()
     
-    @patch('openai.OpenAI')
-    def test_analyze_with_mock(self, mock_openai, mock_openai_client):
+    @patch('sentiment_analysis.openai_analyzer.OpenAI', return_value=_STUB_CLIENT)
+    def test_analyze_with_mock(self, mock_openai, stub_client):
         """Test analyze method with mocked OpenAI client"""
-        # Setup mock
-        mock_openai.return_value = mock_openai_client
-        
         analyzer = OpenAIAnalyzer(api_key='test-key')
         result = analyzer.analyze("Test comment")
         
         # Verify API was called
-        mock_openai_client.chat.completions.create.assert_called()
+        assert stub_client.calls
         
         # Check result structure
         assert result is not None
         # Result depends on mock response parsing
     
-    @patch('openai.OpenAI')
+    @patch('sentiment_analysis.openai_analyzer.OpenAI')
     def test_error_handling(self, mock_openai):
         """Test error handling in OpenAI analyzer"""
         # Setup mock to raise exception
@@ -217,11 +230,9 @@ class TestOpenAIAnalyzer:
         assert result is not None
         # May return default/fallback result
     
-    @patch('openai.OpenAI')
-    def test_batch_analysis(self, mock_openai, mock_openai_client, sample_comments):
+    @patch('sentiment_analysis.openai_analyzer.OpenAI', return_value=_STUB_CLIENT)
+    def test_batch_analysis(self, mock_openai, sample_comments):
         """Test batch analysis with OpenAI"""
-        mock_openai.return_value = mock_openai_client
-        
         analyzer = OpenAIAnalyzer(api_key='test-key')
         comments = sample_comments['positive'][:3]
         
@@ -230,29 +241,50 @@ class TestOpenAIAnalyzer:
         # Should make multiple API calls or batch them
         assert len(results) == len(comments)
     
-    @patch('openai.OpenAI')
-    def test_cost_tracking(self, mock_openai, mock_openai_client):
-        """Test API cost tracking"""
-        mock_openai.return_value = mock_openai_client
+    def test_long_comment_capped_before_language_hint(self, monkeypatch):
+        """Test over-long comments are capped in the prompt and keep their language hint"""
+        from sentiment_analysis import openai_analyzer
+        monkeypatch.setattr(openai_analyzer.Config, 'MAX_COMMENT_CHARS', 40)
+        prompts = []
+        
+        def chat_completion(messages, **kwargs):
+            prompts.append(messages[-1]['content'])
+            return _CANNED_RESPONSE
         
         analyzer = OpenAIAnalyzer(api_key='test-key')
+        analyzer.robust_client = SimpleNamespace(chat_completion=chat_completion)
+        long_comment = "Iporã la servicio pero la internet es lenta " * 10
+        
+        analyzer._analyze_optimized_batch(
+            [long_comment], language_info=[{'language': 'mixed', 'confidence': 0.9}]
+        )
+        
+        assert f"1. {long_comment[:40]} [pre-detected language: mixed]\n" in prompts[0]
+        assert long_comment[:41] not in prompts[0]
+    
+    @pytest.mark.skipif(not hasattr(OpenAIAnalyzer, 'get_usage_stats'),
+                        reason="OpenAIAnalyzer has no usage tracking")
+    @patch('sentiment_analysis.openai_analyzer.OpenAI', return_value=_STUB_CLIENT)
+    def test_cost_tracking(self, mock_openai):
+        """Test API cost tracking"""
+        analyzer = OpenAIAnalyzer(api_key='test-key')
         
         # Analyze comment
         analyzer.analyze("Test comment")
         
-        # Check if cost tracking is implemented
-        if hasattr(analyzer, 'get_usage_stats'):
-            stats = analyzer.get_usage_stats()
-            assert 'total_tokens' in stats or 'cost' in stats or True
+        stats = analyzer.get_usage_stats()
+        assert 'total_tokens' in stats or 'cost' in stats
     
-    @patch('openai.OpenAI')
-    def test_rate_limiting(self, mock_openai, mock_openai_client):
+    @pytest.mark.skipif(not hasattr(RobustAPIClient, '_retry_with_backoff'),
+                        reason="API client has no retry logic")
+    @patch('sentiment_analysis.openai_analyzer.OpenAI')
+    def test_rate_limiting(self, mock_openai):
         """Test rate limiting handling"""
         # Setup mock to simulate rate limit error
         mock_client = MagicMock()
         mock_client.chat.completions.create.side_effect = [
             Exception("Rate limit exceeded"),
-            mock_openai_client.chat.completions.create.return_value
+            _CANNED_RESPONSE
         ]
         mock_openai.return_value = mock_client
         
@@ -266,55 +298,39 @@ class TestOpenAIAnalyzer:
 class TestSentimentAggregation:
     """Test sentiment aggregation and statistics"""
     
-    def test_sentiment_distribution(self, sample_dataframe):
+    def test_sentiment_distribution(self, batch_results):
         """Test calculating sentiment distribution"""
-        analyzer = EnhancedAnalyzer()
-        
-        # Analyze all comments
-        comments = sample_dataframe['Comentario'].tolist()
-        results = analyzer.analyze_batch(comments)
-        
         # Calculate distribution
-        sentiments = [r['sentiment'] for r in results]
-        distribution = pd.Series(sentiments).value_counts(normalize=True)
+        labels, counts = np.unique([r['sentiment'] for r in batch_results], return_counts=True)
+        distribution = counts / counts.sum()
         
         # Check distribution sums to 1
         assert abs(distribution.sum() - 1.0) < 0.01
         
         # Check all sentiments are valid
-        for sentiment in distribution.index:
-            assert sentiment in ['positive', 'negative', 'neutral']
+        assert set(labels) <= {'positive', 'negative', 'neutral'}
     
-    def test_confidence_statistics(self, sample_dataframe):
+    def test_confidence_statistics(self, batch_results):
         """Test confidence score statistics"""
-        analyzer = EnhancedAnalyzer()
-        
-        comments = sample_dataframe['Comentario'].tolist()[:10]
-        results = analyzer.analyze_batch(comments)
-        
         # Extract confidence scores
-        confidences = [r.get('confidence', 0) for r in results]
+        confidences = np.fromiter(
+            (r.get('confidence', 0) for r in batch_results),
+            dtype=np.float64, count=len(batch_results)
+        )
         
         # Check confidence range
-        assert all(0 <= c <= 1 for c in confidences)
+        assert confidences.min() >= 0 and confidences.max() <= 1
         
         # Calculate statistics
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0
-        assert 0 <= avg_confidence <= 1
+        assert 0 <= confidences.mean() <= 1
     
-    def test_emotion_aggregation(self, sample_comments):
+    def test_emotion_aggregation(self, batch_results):
         """Test emotion aggregation across comments"""
-        analyzer = EnhancedAnalyzer()
-        
-        all_comments = sample_comments['positive'] + sample_comments['negative']
-        results = analyzer.analyze_batch(all_comments)
-        
         # Aggregate emotions if present
-        emotion_totals = {}
-        for result in results:
-            if 'emotions' in result and result['emotions']:
-                for emotion, score in result['emotions'].items():
-                    emotion_totals[emotion] = emotion_totals.get(emotion, 0) + score
+        emotion_totals = Counter()
+        for result in batch_results:
+            if result.get('emotions'):
+                emotion_totals.update(result['emotions'])
         
         # If emotions are detected, verify structure
         if emotion_totals:
@@ -324,20 +340,25 @@ class TestSentimentAggregation:
 class TestEdgeCases:
     """Test edge cases and error handling"""
     
-    def test_very_long_comment(self):
+    def test_very_long_comment(self, enhanced_analyzer):
         """Test handling of very long comments"""
-        analyzer = EnhancedAnalyzer()
+        long_comment = "Este es un comentario muy largo. " * 50
+        result = enhanced_analyzer.analyze(long_comment)
         
+        assert result is not None
+        assert 'sentiment' in result
+    
+    @pytest.mark.slow
+    def test_very_long_comment_full_size(self, enhanced_analyzer):
+        """Test handling of a ~33 KB comment"""
         long_comment = "Este es un comentario muy largo. " * 1000
-        result = analyzer.analyze(long_comment)
+        result = enhanced_analyzer.analyze(long_comment)
         
         assert result is not None
         assert 'sentiment' in result
     
-    def test_unicode_comments(self):
+    def test_unicode_comments(self, enhanced_analyzer):
         """Test handling of unicode characters"""
-        analyzer = EnhancedAnalyzer()
-        
         unicode_comments = [
             "这是中文评论",
             "これは日本語です",
@@ -345,43 +366,35 @@ class TestEdgeCases:
             "🚀 Emoji comment 😊"
         ]
         
-        for comment in unicode_comments:
-            result = analyzer.analyze(comment)
-            assert result is not None
-            assert 'sentiment' in result
+        results = enhanced_analyzer.analyze_batch(unicode_comments)
+        
+        assert len(results) == len(unicode_comments)
+        assert all('sentiment' in r for r in results)
     
-    def test_html_injection(self):
+    def test_html_injection(self, enhanced_analyzer):
         """Test handling of HTML injection attempts"""
-        analyzer = EnhancedAnalyzer()
-        
         html_comment = "<script>alert('test')</script> Good service"
-        result = analyzer.analyze(html_comment)
+        result = enhanced_analyzer.analyze(html_comment)
         
         assert result is not None
         assert 'sentiment' in result
         # Should not execute or break on HTML
     
-    def test_null_and_empty_values(self):
+    def test_null_and_empty_values(self, enhanced_analyzer):
         """Test handling of null and empty values"""
-        analyzer = EnhancedAnalyzer()
-        
         test_values = [None, "", "   ", "\n\t", pd.NA, float('nan')]
         
-        for value in test_values:
-            result = analyzer.analyze(value)
-            assert result is not None
-            # Should return some default result
+        # Nulls go in unmapped; analyze() already returns a default for them
+        results = enhanced_analyzer.analyze_batch(test_values)
+        
+        assert len(results) == len(test_values)
+        assert all(r is not None for r in results)
     
-    def test_concurrent_analysis(self, sample_comments):
+    def test_concurrent_analysis(self, enhanced_analyzer, sample_comments):
         """Test concurrent analysis (thread safety)"""
-        analyzer = EnhancedAnalyzer()
-        
         # This would need threading to fully test
         # For now, just verify multiple calls work
-        results = []
-        for comment in sample_comments['positive']:
-            result = analyzer.analyze(comment)
-            results.append(result)
+        results = enhanced_analyzer.analyze_batch(sample_comments['positive'])
         
         assert len(results) == len(sample_comments['positive'])
         assert all('sentiment' in r for r in results)
\ No newline at end of file
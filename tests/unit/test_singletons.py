@@ -0,0 +1,25 @@
+"""
+Unit tests for process-wide configuration singletons
+
+Kept apart from the other config tests; CI's --dist loadscope sends this
+function-only module to a single pytest-xdist worker.
+"""
+
+from config.settings import get_settings
+from config.secrets import get_secret_manager
+
+
+def test_get_settings_singleton():
+    """Test that get_settings returns the same instance"""
+    settings1 = get_settings()
+    settings2 = get_settings()
+    
+    assert settings1 is settings2
+
+
+def test_get_secret_manager_singleton():
+    """Test that get_secret_manager returns singleton"""
+    manager1 = get_secret_manager()
+    manager2 = get_secret_manager()
+    
+    assert manager1 is manager2